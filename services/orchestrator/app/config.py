@@ -6,14 +6,21 @@ from pathlib import Path
 from typing import Optional
 
 
+# Settings are resolved once at import, so read the environment once too.
+_ENV = dict(os.environ)
+
+
 def _env(key: str, default: Optional[str] = None) -> Optional[str]:
-    val = os.getenv(key)
-    if val is None or val == "":
+    val = _ENV.get(key)
+    if not val:
         return default
     return val
 
 
-@dataclass(frozen=True)
+_DATA_DIR = Path(_env("DATA_DIR", str(Path.cwd() / "data")))
+
+
+@dataclass(frozen=True, slots=True)
 class Settings:
     # App
     app_name: str = _env("APP_NAME", "OpenAgent Workbench")
@@ -21,11 +28,11 @@ class Settings:
     port: int = int(_env("APP_PORT", "8787"))
 
     # Storage
-    data_dir: Path = Path(_env("DATA_DIR", str(Path.cwd() / "data"))).resolve()
-    db_path: Path = Path(_env("DB_PATH", str(Path(_env("DATA_DIR", str(Path.cwd() / "data"))) / "workbench.db"))).resolve()
-    workspaces_dir: Path = Path(_env("WORKSPACES_DIR", str(Path(_env("DATA_DIR", str(Path.cwd() / "data"))) / "workspaces"))).resolve()
-    artifacts_dir: Path = Path(_env("ARTIFACTS_DIR", str(Path(_env("DATA_DIR", str(Path.cwd() / "data"))) / "artifacts"))).resolve()
-    logs_dir: Path = Path(_env("LOGS_DIR", str(Path(_env("DATA_DIR", str(Path.cwd() / "data"))) / "logs"))).resolve()
+    data_dir: Path = _DATA_DIR.resolve()
+    db_path: Path = Path(_env("DB_PATH", str(_DATA_DIR / "workbench.db"))).resolve()
+    workspaces_dir: Path = Path(_env("WORKSPACES_DIR", str(_DATA_DIR / "workspaces"))).resolve()
+    artifacts_dir: Path = Path(_env("ARTIFACTS_DIR", str(_DATA_DIR / "artifacts"))).resolve()
+    logs_dir: Path = Path(_env("LOGS_DIR", str(_DATA_DIR / "logs"))).resolve()
 
     # LLM provider (OpenAI-compatible)
     llm_base_url: str = _env("OPENAI_BASE_URL", "https://0-0.pro/v1")
@@ -68,7 +75,16 @@ class Settings:
 
 
 settings = Settings()
-settings.data_dir.mkdir(parents=True, exist_ok=True)
-settings.workspaces_dir.mkdir(parents=True, exist_ok=True)
-settings.artifacts_dir.mkdir(parents=True, exist_ok=True)
-settings.logs_dir.mkdir(parents=True, exist_ok=True)
+
+_DIRS_READY = False
+
+
+def ensure_dirs() -> None:
+    # Create storage folders on first use rather than at import; a single stat covers the common case.
+    global _DIRS_READY
+    if _DIRS_READY:
+        return
+    for p in dict.fromkeys((settings.data_dir, settings.workspaces_dir, settings.artifacts_dir, settings.logs_dir)):
+        if not p.is_dir():
+            p.mkdir(parents=True, exist_ok=True)
+    _DIRS_READY = True
@@ -4,41 +4,98 @@ import json
 import sqlite3
 import threading
 import time
+import weakref
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from .config import settings
+from .config import ensure_dirs, settings
 
+try:
+    import orjson
+except Exception:  # optional speedup; stdlib json is the fallback
+    orjson = None  # type: ignore[assignment]
 
-_DB_LOCK = threading.Lock()
 
+# Applied to every new connection (journal_mode is set separately since it needs a fallback).
+# synchronous=NORMAL is durable under WAL except for the last commits on power loss.
+_CONNECT_PRAGMAS = """
+PRAGMA synchronous=NORMAL;
+PRAGMA busy_timeout=30000;
+PRAGMA cache_size=-20000;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA foreign_keys=ON;
+"""
 
-def _dict_factory(cursor: sqlite3.Cursor, row: Tuple[Any, ...]) -> Dict[str, Any]:
-    d = {}
-    for idx, col in enumerate(cursor.description):
-        d[col[0]] = row[idx]
-    return d
+# Pooled connections live for the whole process, so keep a larger prepared-statement cache
+# (keyed by SQL text) than the driver default of 128.
+_CACHED_STATEMENTS = 256
 
+# Hot statements shared across modules; one SQL string means one cached prepared statement.
+SQL_INSERT_EVENT_LOG = "INSERT INTO event_log (id, task_id, step_id, type, payload_json, ts, created_at) VALUES (?,?,?,?,?,?,?)"
 
-def connect() -> sqlite3.Connection:
+
+def _make_dict_factory() -> Callable[[sqlite3.Cursor, Tuple[Any, ...]], Dict[str, Any]]:
+    # Callers use dict access (`row.get(...)`), so keep plain dicts but compute column names once per
+    # statement: `cursor.description` is the same tuple object for every row of a result set.
+    # One factory per connection; each connection is owned by a single thread.
+    cache: List[Any] = [None, ()]
+
+    def factory(cursor: sqlite3.Cursor, row: Tuple[Any, ...]) -> Dict[str, Any]:
+        desc = cursor.description
+        if desc is not cache[0]:
+            cache[1] = tuple(col[0] for col in desc)
+            cache[0] = desc
+        return dict(zip(cache[1], row))
+
+    return factory
+
+
+class _Connection(sqlite3.Connection):
+    # Python subclass so connections can be tracked weakly (see _ThreadConns).
+    pass
+
+
+def connect(*, readonly: bool = False) -> sqlite3.Connection:
     # Ensure parent folders exist (desktop .exe runs under AppData).
-    try:
-        settings.db_path.parent.mkdir(parents=True, exist_ok=True)
-    except Exception:
-        pass
+    if not readonly:
+        try:
+            settings.db_path.parent.mkdir(parents=True, exist_ok=True)
+        except Exception:
+            pass
 
     last_err: Optional[BaseException] = None
     for i in range(5):
         try:
-            con = sqlite3.connect(str(settings.db_path), check_same_thread=False, timeout=30)
-            con.row_factory = _dict_factory
+            if readonly:
+                con = sqlite3.connect(
+                    settings.db_path.as_uri() + "?mode=ro",
+                    uri=True,
+                    check_same_thread=False,
+                    cached_statements=_CACHED_STATEMENTS,
+                    factory=_Connection,
+                )
+            else:
+                con = sqlite3.connect(
+                    str(settings.db_path),
+                    check_same_thread=False,
+                    cached_statements=_CACHED_STATEMENTS,
+                    factory=_Connection,
+                )
+            con.row_factory = _make_dict_factory()
+            # Lock waits are governed by PRAGMA busy_timeout, so apply the bundle before switching journal mode.
+            con.executescript(_CONNECT_PRAGMAS)
+            if readonly:
+                # journal_mode is persistent in the file; the writer owns it.
+                return con
             # WAL improves concurrent read/write patterns, but can fail transiently if the file is being created.
             try:
                 con.execute("PRAGMA journal_mode=WAL;")
             except sqlite3.OperationalError:
                 con.execute("PRAGMA journal_mode=DELETE;")
-            con.execute("PRAGMA foreign_keys=ON;")
+            # Writers manage transactions explicitly (see get_write_conn); stop the driver's implicit DEFERRED BEGIN.
+            con.isolation_level = None
             return con
         except sqlite3.OperationalError as e:
             last_err = e
@@ -50,234 +107,402 @@ def connect() -> sqlite3.Connection:
     raise sqlite3.OperationalError(f"failed to open sqlite db: {last_err}")
 
 
+class _ThreadConns:
+    """
+    One long-lived sqlite connection per thread.
+
+    Each thread opens its own connection on first use and keeps it, so PRAGMAs and the page cache
+    survive across queries and no Python-level lock sits in front of the database: WAL lets readers
+    run alongside the writer, and busy_timeout queues writers inside sqlite itself.
+    """
+
+    def __init__(self, *, readonly: bool) -> None:
+        self._readonly = readonly
+        self._local = threading.local()
+        # Weak so a finished thread's connection is closed as soon as its thread-local is dropped.
+        self._all: "weakref.WeakSet[sqlite3.Connection]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def get(self) -> sqlite3.Connection:
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = connect(readonly=self._readonly)
+            self._local.con = con
+            with self._lock:
+                self._all.add(con)
+        return con
+
+    def close_all(self) -> None:
+        with self._lock:
+            conns = list(self._all)
+            self._all = weakref.WeakSet()
+            self._local = threading.local()
+        for con in conns:
+            try:
+                con.close()
+            except Exception:
+                pass
+
+
+_readers = _ThreadConns(readonly=True)
+_writers = _ThreadConns(readonly=False)
+
+# Monotonic time of the last committed write; lets maintenance wait for a quiet moment.
+_last_write = 0.0
+# Count of committed write transactions in this process; lets HTTP handlers build cheap ETags.
+_write_seq = 0
+
+
 @contextmanager
-def get_conn() -> Iterable[sqlite3.Connection]:
-    # sqlite is fine with multiple connections + WAL; lock schema ops
-    con = connect()
+def get_read_conn() -> Iterable[sqlite3.Connection]:
+    yield _readers.get()
+
+
+@contextmanager
+def get_write_conn() -> Iterable[sqlite3.Connection]:
+    # Take the write lock upfront; a DEFERRED transaction upgraded mid-way can fail with SQLITE_BUSY.
+    global _last_write, _write_seq
+    con = _writers.get()
+    con.execute("BEGIN IMMEDIATE")
     try:
         yield con
         con.commit()
-    finally:
-        con.close()
+    except BaseException:
+        con.rollback()
+        raise
+    _last_write = time.monotonic()
+    _write_seq += 1
+
+
+def write_seq() -> int:
+    return _write_seq
+
+
+# Bump SCHEMA_VERSION whenever _COLUMN_MIGRATIONS gains an entry.
+SCHEMA_VERSION = 1
+
+# Best-effort schema evolution for runner backends (e.g., UAK) and the KB index.
+_COLUMN_MIGRATIONS = (
+    "ALTER TABLE tasks ADD COLUMN backend TEXT;",
+    "ALTER TABLE tasks ADD COLUMN backend_run_id TEXT;",
+    "ALTER TABLE tasks ADD COLUMN backend_thread_id TEXT;",
+    "ALTER TABLE tasks ADD COLUMN backend_interrupt_id TEXT;",
+    "ALTER TABLE tasks ADD COLUMN backend_resume_token TEXT;",
+    "ALTER TABLE tasks ADD COLUMN backend_last_offset INTEGER;",
+    "ALTER TABLE kb_chunks ADD COLUMN embedding_dtype TEXT NOT NULL DEFAULT 'f32';",
+)
+
+
+def optimize_db() -> None:
+    # Refresh query-planner statistics; SQLite recommends this periodically and before closing.
+    _writers.get().execute("PRAGMA optimize;")
+
+
+def checkpoint_wal(*, idle_seconds: float = 0.0) -> bool:
+    # Fold the WAL back into the main file and truncate it, off the hot write path.
+    # Skipped (returns False) while writes are still arriving.
+    if time.monotonic() - _last_write < idle_seconds:
+        return False
+    _writers.get().execute("PRAGMA wal_checkpoint(TRUNCATE);")
+    return True
+
+
+def close_db() -> None:
+    for fn in (optimize_db, checkpoint_wal):
+        try:
+            fn()
+        except Exception:
+            pass
+    _readers.close_all()
+    _writers.close_all()
 
 
 def init_db() -> None:
-    with _DB_LOCK:
-        with get_conn() as con:
-            con.executescript(
-                """
-                CREATE TABLE IF NOT EXISTS workspaces (
-                    id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    path TEXT NOT NULL,
-                    created_at TEXT NOT NULL
-                );
-
-                CREATE TABLE IF NOT EXISTS skills (
-                    id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    description TEXT,
-                    yaml_path TEXT,
-                    system_prompt TEXT NOT NULL,
-                    allowed_tools_json TEXT NOT NULL,
-                    default_mode TEXT NOT NULL,
-                    created_at TEXT NOT NULL
-                );
-
-                CREATE TABLE IF NOT EXISTS tasks (
-                    id TEXT PRIMARY KEY,
-                    workspace_id TEXT NOT NULL,
-                    skill_id TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    mode TEXT NOT NULL,
-                    goal TEXT NOT NULL,
-                    plan_json TEXT,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    current_step INTEGER NOT NULL DEFAULT 0,
-                    output_path TEXT,
-                    error TEXT,
-                    FOREIGN KEY(workspace_id) REFERENCES workspaces(id) ON DELETE CASCADE,
-                    FOREIGN KEY(skill_id) REFERENCES skills(id) ON DELETE CASCADE
-                );
-
-                CREATE TABLE IF NOT EXISTS steps (
-                    id TEXT PRIMARY KEY,
-                    task_id TEXT NOT NULL,
-                    idx INTEGER NOT NULL,
-                    name TEXT NOT NULL,
-                    tool TEXT NOT NULL,
-                    args_json TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    requires_approval INTEGER NOT NULL DEFAULT 0,
-                    result_json TEXT,
-                    error TEXT,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    FOREIGN KEY(task_id) REFERENCES tasks(id) ON DELETE CASCADE
-                );
-
-                CREATE TABLE IF NOT EXISTS approvals (
-                    id TEXT PRIMARY KEY,
-                    task_id TEXT NOT NULL,
-                    step_id TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    requested_at TEXT NOT NULL,
-                    decided_at TEXT,
-                    decision TEXT,
-                    reason TEXT,
-                    FOREIGN KEY(task_id) REFERENCES tasks(id) ON DELETE CASCADE,
-                    FOREIGN KEY(step_id) REFERENCES steps(id) ON DELETE CASCADE
-                );
-
-                CREATE TABLE IF NOT EXISTS schedules (
-                    id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    cron_expr TEXT NOT NULL,
-                    workspace_id TEXT NOT NULL,
-                    skill_id TEXT NOT NULL,
-                    mode TEXT NOT NULL,
-                    enabled INTEGER NOT NULL DEFAULT 1,
-                    payload_json TEXT,
-                    next_run_at TEXT,
-                    last_run_at TEXT,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    FOREIGN KEY(workspace_id) REFERENCES workspaces(id) ON DELETE CASCADE,
-                    FOREIGN KEY(skill_id) REFERENCES skills(id) ON DELETE CASCADE
-                );
-
-                -- Event log for timeline/replay.
-                CREATE TABLE IF NOT EXISTS event_log (
-                    id TEXT PRIMARY KEY,
-                    task_id TEXT NOT NULL,
-                    step_id TEXT,
-                    type TEXT NOT NULL,
-                    payload_json TEXT NOT NULL,
-                    ts REAL NOT NULL,
-                    created_at TEXT NOT NULL,
-                    FOREIGN KEY(task_id) REFERENCES tasks(id) ON DELETE CASCADE
-                );
-                CREATE INDEX IF NOT EXISTS idx_event_log_task_ts ON event_log (task_id, ts);
-
-                -- Workspace-level permission policies (ask_once / always_allow / always_deny).
-                CREATE TABLE IF NOT EXISTS workspace_policies (
-                    workspace_id TEXT NOT NULL,
-                    scope TEXT NOT NULL,
-                    policy TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    PRIMARY KEY (workspace_id, scope),
-                    FOREIGN KEY(workspace_id) REFERENCES workspaces(id) ON DELETE CASCADE
-                );
-
-                -- Recipes/templates for one-click workflows.
-                CREATE TABLE IF NOT EXISTS recipes (
-                    id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    description TEXT,
-                    goal_template TEXT NOT NULL,
-                    form_json TEXT,
-                    default_mode TEXT NOT NULL,
-                    enabled INTEGER NOT NULL DEFAULT 1,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                );
-
-                -- Extra skill metadata (enabled flag, install source, etc).
-                CREATE TABLE IF NOT EXISTS skill_meta (
-                    skill_id TEXT PRIMARY KEY,
-                    enabled INTEGER NOT NULL DEFAULT 1,
-                    source TEXT,
-                    updated_at TEXT NOT NULL,
-                    FOREIGN KEY(skill_id) REFERENCES skills(id) ON DELETE CASCADE
-                );
-
-                -- MCP server registry (config + enable/disable + healthcheck args).
-                CREATE TABLE IF NOT EXISTS mcp_servers (
-                    id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    command TEXT NOT NULL,
-                    args_json TEXT NOT NULL,
-                    env_json TEXT NOT NULL,
-                    healthcheck_args_json TEXT NOT NULL,
-                    enabled INTEGER NOT NULL DEFAULT 1,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                );
-
-                CREATE TABLE IF NOT EXISTS kb_docs (
-                    id TEXT PRIMARY KEY,
-                    workspace_id TEXT NOT NULL,
-                    filename TEXT NOT NULL,
-                    path TEXT NOT NULL,
-                    sha256 TEXT NOT NULL,
-                    indexed_at TEXT,
-                    created_at TEXT NOT NULL,
-                    FOREIGN KEY(workspace_id) REFERENCES workspaces(id) ON DELETE CASCADE
-                );
-
-                CREATE TABLE IF NOT EXISTS kb_chunks (
-                    id TEXT PRIMARY KEY,
-                    doc_id TEXT NOT NULL,
-                    chunk_idx INTEGER NOT NULL,
-                    text TEXT NOT NULL,
-                    embedding_blob BLOB NOT NULL,
-                    embedding_dim INTEGER NOT NULL,
-                    created_at TEXT NOT NULL,
-                    FOREIGN KEY(doc_id) REFERENCES kb_docs(id) ON DELETE CASCADE
-                );
-
-                CREATE INDEX IF NOT EXISTS idx_steps_task ON steps(task_id);
-                CREATE INDEX IF NOT EXISTS idx_approvals_task ON approvals(task_id);
-                CREATE INDEX IF NOT EXISTS idx_kb_docs_workspace ON kb_docs(workspace_id);
-                """
-            )
-
-            # Best-effort schema evolution for runner backends (e.g., UAK).
-            # SQLite has no IF NOT EXISTS for columns; ignore errors if already applied.
-            for ddl in (
-                "ALTER TABLE tasks ADD COLUMN backend TEXT;",
-                "ALTER TABLE tasks ADD COLUMN backend_run_id TEXT;",
-                "ALTER TABLE tasks ADD COLUMN backend_thread_id TEXT;",
-                "ALTER TABLE tasks ADD COLUMN backend_interrupt_id TEXT;",
-                "ALTER TABLE tasks ADD COLUMN backend_resume_token TEXT;",
-                "ALTER TABLE tasks ADD COLUMN backend_last_offset INTEGER;",
-            ):
+    ensure_dirs()
+    # executescript() COMMITs any open transaction before running, so a BEGIN IMMEDIATE wrapper would neither
+    # hold the write lock nor make this atomic. The DDL runs in autocommit; every statement is IF NOT EXISTS.
+    _writers.get().executescript(
+        """
+        CREATE TABLE IF NOT EXISTS workspaces (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            path TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS skills (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            description TEXT,
+            yaml_path TEXT,
+            system_prompt TEXT NOT NULL,
+            allowed_tools_json TEXT NOT NULL,
+            default_mode TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS tasks (
+            id TEXT PRIMARY KEY,
+            workspace_id TEXT NOT NULL,
+            skill_id TEXT NOT NULL,
+            status TEXT NOT NULL,
+            mode TEXT NOT NULL,
+            goal TEXT NOT NULL,
+            plan_json TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            current_step INTEGER NOT NULL DEFAULT 0,
+            output_path TEXT,
+            error TEXT,
+            FOREIGN KEY(workspace_id) REFERENCES workspaces(id) ON DELETE CASCADE,
+            FOREIGN KEY(skill_id) REFERENCES skills(id) ON DELETE CASCADE
+        );
+
+        CREATE TABLE IF NOT EXISTS steps (
+            id TEXT PRIMARY KEY,
+            task_id TEXT NOT NULL,
+            idx INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            tool TEXT NOT NULL,
+            args_json TEXT NOT NULL,
+            status TEXT NOT NULL,
+            requires_approval INTEGER NOT NULL DEFAULT 0,
+            result_json TEXT,
+            error TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            FOREIGN KEY(task_id) REFERENCES tasks(id) ON DELETE CASCADE
+        );
+
+        CREATE TABLE IF NOT EXISTS approvals (
+            id TEXT PRIMARY KEY,
+            task_id TEXT NOT NULL,
+            step_id TEXT NOT NULL,
+            status TEXT NOT NULL,
+            requested_at TEXT NOT NULL,
+            decided_at TEXT,
+            decision TEXT,
+            reason TEXT,
+            FOREIGN KEY(task_id) REFERENCES tasks(id) ON DELETE CASCADE,
+            FOREIGN KEY(step_id) REFERENCES steps(id) ON DELETE CASCADE
+        );
+
+        CREATE TABLE IF NOT EXISTS schedules (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            cron_expr TEXT NOT NULL,
+            workspace_id TEXT NOT NULL,
+            skill_id TEXT NOT NULL,
+            mode TEXT NOT NULL,
+            enabled INTEGER NOT NULL DEFAULT 1,
+            payload_json TEXT,
+            next_run_at TEXT,
+            last_run_at TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            FOREIGN KEY(workspace_id) REFERENCES workspaces(id) ON DELETE CASCADE,
+            FOREIGN KEY(skill_id) REFERENCES skills(id) ON DELETE CASCADE
+        );
+
+        -- Event log for timeline/replay.
+        CREATE TABLE IF NOT EXISTS event_log (
+            id TEXT PRIMARY KEY,
+            task_id TEXT NOT NULL,
+            step_id TEXT,
+            type TEXT NOT NULL,
+            payload_json TEXT NOT NULL,
+            ts REAL NOT NULL,
+            created_at TEXT NOT NULL,
+            FOREIGN KEY(task_id) REFERENCES tasks(id) ON DELETE CASCADE
+        );
+        CREATE INDEX IF NOT EXISTS idx_event_log_task_ts ON event_log (task_id, ts);
+        -- Index entries end in rowid, so this serves the timeline's `task_id=? AND rowid>? ORDER BY rowid`
+        -- as a range scan with no temp sort (the (task_id, ts) index orders by ts instead).
+        CREATE INDEX IF NOT EXISTS idx_event_log_task ON event_log (task_id);
+
+        -- Workspace-level permission policies (ask_once / always_allow / always_deny).
+        CREATE TABLE IF NOT EXISTS workspace_policies (
+            workspace_id TEXT NOT NULL,
+            scope TEXT NOT NULL,
+            policy TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (workspace_id, scope),
+            FOREIGN KEY(workspace_id) REFERENCES workspaces(id) ON DELETE CASCADE
+        );
+
+        -- Recipes/templates for one-click workflows.
+        CREATE TABLE IF NOT EXISTS recipes (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            description TEXT,
+            goal_template TEXT NOT NULL,
+            form_json TEXT,
+            default_mode TEXT NOT NULL,
+            enabled INTEGER NOT NULL DEFAULT 1,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+
+        -- Extra skill metadata (enabled flag, install source, etc).
+        CREATE TABLE IF NOT EXISTS skill_meta (
+            skill_id TEXT PRIMARY KEY,
+            enabled INTEGER NOT NULL DEFAULT 1,
+            source TEXT,
+            updated_at TEXT NOT NULL,
+            FOREIGN KEY(skill_id) REFERENCES skills(id) ON DELETE CASCADE
+        );
+
+        -- MCP server registry (config + enable/disable + healthcheck args).
+        CREATE TABLE IF NOT EXISTS mcp_servers (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            command TEXT NOT NULL,
+            args_json TEXT NOT NULL,
+            env_json TEXT NOT NULL,
+            healthcheck_args_json TEXT NOT NULL,
+            enabled INTEGER NOT NULL DEFAULT 1,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS kb_docs (
+            id TEXT PRIMARY KEY,
+            workspace_id TEXT NOT NULL,
+            filename TEXT NOT NULL,
+            path TEXT NOT NULL,
+            sha256 TEXT NOT NULL,
+            indexed_at TEXT,
+            created_at TEXT NOT NULL,
+            FOREIGN KEY(workspace_id) REFERENCES workspaces(id) ON DELETE CASCADE
+        );
+
+        CREATE TABLE IF NOT EXISTS kb_chunks (
+            id TEXT PRIMARY KEY,
+            doc_id TEXT NOT NULL,
+            chunk_idx INTEGER NOT NULL,
+            text TEXT NOT NULL,
+            embedding_blob BLOB NOT NULL,
+            embedding_dim INTEGER NOT NULL,
+            created_at TEXT NOT NULL,
+            FOREIGN KEY(doc_id) REFERENCES kb_docs(id) ON DELETE CASCADE
+        );
+
+        -- (task_id, idx) serves both task_id lookups and the ORDER BY idx step listings.
+        DROP INDEX IF EXISTS idx_steps_task;
+        CREATE INDEX IF NOT EXISTS idx_tasks_updated ON tasks(updated_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_steps_task_idx ON steps(task_id, idx);
+        CREATE INDEX IF NOT EXISTS idx_approvals_task ON approvals(task_id);
+        CREATE INDEX IF NOT EXISTS idx_approvals_step ON approvals(step_id, requested_at);
+        CREATE INDEX IF NOT EXISTS idx_schedules_next_run ON schedules(next_run_at) WHERE enabled=1;
+        CREATE INDEX IF NOT EXISTS idx_kb_docs_workspace ON kb_docs(workspace_id);
+        """
+    )
+
+    # Column migrations run once per schema version, not on every start.
+    with get_write_conn() as con:
+        version = int(con.execute("PRAGMA user_version;").fetchone()["user_version"] or 0)
+        if version < SCHEMA_VERSION:
+            # SQLite has no IF NOT EXISTS for columns; databases created before user_version was
+            # tracked may already have some of these, so ignore "duplicate column" errors.
+            for ddl in _COLUMN_MIGRATIONS:
                 try:
                     con.execute(ddl)
-                except Exception:
+                except sqlite3.OperationalError:
                     pass
+            con.execute(f"PRAGMA user_version={SCHEMA_VERSION};")
 
 
 def q_one(sql: str, params: Tuple[Any, ...] = ()) -> Optional[Dict[str, Any]]:
-    with get_conn() as con:
+    with get_read_conn() as con:
         cur = con.execute(sql, params)
         row = cur.fetchone()
         return row
 
 
 def q_all(sql: str, params: Tuple[Any, ...] = ()) -> List[Dict[str, Any]]:
-    with get_conn() as con:
+    with get_read_conn() as con:
         cur = con.execute(sql, params)
         rows = cur.fetchall()
         return list(rows)
 
 
+# (sql, params, prepare) -> (write_seq at fetch, monotonic fetch time, rows). Any committed write bumps the
+# seq, so an entry is exact until the next write; the TTL only bounds staleness from writers outside this process.
+_QCACHE: Dict[Tuple[str, Tuple[Any, ...], Any], Tuple[int, float, List[Dict[str, Any]]]] = {}
+_QCACHE_LOCK = threading.Lock()
+_QCACHE_MAX = 256
+
+
+def q_all_cached(
+    sql: str,
+    params: Tuple[Any, ...] = (),
+    ttl: float = 2.0,
+    prepare: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    # For small read-mostly list queries. `prepare` decorates each row in place once per fetch (e.g. decoding
+    # JSON columns), so cache hits skip that work too. Rows are shallow-copied because handlers annotate them
+    # in place; values set by `prepare` are shared between callers and must be treated as read-only.
+    key = (sql, params, prepare)
+    now = time.monotonic()
+    seq = _write_seq
+    with _QCACHE_LOCK:
+        hit = _QCACHE.get(key)
+    if hit is not None and hit[0] == seq and now - hit[1] < ttl:
+        return [dict(r) for r in hit[2]]
+    rows = q_all(sql, params)
+    if prepare is not None:
+        for r in rows:
+            prepare(r)
+    with _QCACHE_LOCK:
+        if len(_QCACHE) >= _QCACHE_MAX:
+            _QCACHE.clear()
+        _QCACHE[key] = (seq, now, rows)
+    return [dict(r) for r in rows]
+
+
+def iter_blobs(table: str, column: str, rowids: Iterable[int]) -> Iterator[Tuple[int, bytes]]:
+    # Incremental BLOB I/O: read one cell at a time instead of materializing every blob in a result set.
+    # Rows deleted since their rowid was selected are skipped.
+    with get_read_conn() as con:
+        for rowid in rowids:
+            try:
+                with con.blobopen(table, column, int(rowid), readonly=True) as blob:
+                    data = blob.read()
+            except sqlite3.OperationalError:
+                continue
+            yield int(rowid), data
+
+
 def exec_sql(sql: str, params: Tuple[Any, ...] = ()) -> None:
-    with get_conn() as con:
+    with get_write_conn() as con:
         con.execute(sql, params)
 
 
 def exec_many(sql: str, params_list: List[Tuple[Any, ...]]) -> None:
-    with get_conn() as con:
+    # The whole batch runs inside one BEGIN IMMEDIATE transaction: a single lock acquisition and commit.
+    if not params_list:
+        return
+    with get_write_conn() as con:
         con.executemany(sql, params_list)
 
 
 def to_json(obj: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            # e.g. integers beyond 64 bits; stdlib json handles those.
+            pass
     return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
 
 
 def from_json(s: Optional[str]) -> Any:
     if not s:
         return None
+    if orjson is not None:
+        try:
+            return orjson.loads(s)
+        except ValueError:
+            # Older rows may contain NaN/Infinity written by stdlib json; let it decide.
+            pass
     return json.loads(s)
@@ -1,24 +1,41 @@
 from __future__ import annotations
 
+import functools
 import os
-import threading
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk, messagebox
 
-import requests
-
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8787")
 ADMIN_TOKEN = os.getenv("UI_ADMIN_TOKEN", os.getenv("ADMIN_TOKEN", "admin"))
+# (connect, read) seconds
+HTTP_TIMEOUT = (3, 30)
+
+# Background I/O for button clicks and refreshes; reuses threads instead of spawning one per call.
+_EXEC = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ui-io")
+
+
+@functools.cache
+def _session():
+    # `requests` is imported on first use (it is slow to import and only needed once the window is up).
+    # One keep-alive session for all backend calls instead of a new TCP connection per request.
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    sess = requests.Session()
+    sess.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    sess.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    return sess
 
 
 def api_get(path: str):
-    r = requests.get(f"{BACKEND_URL}{path}")
+    r = _session().get(f"{BACKEND_URL}{path}", timeout=HTTP_TIMEOUT)
     r.raise_for_status()
     return r.json()
 
 
 def api_post(path: str, json_payload=None):
-    r = requests.post(f"{BACKEND_URL}{path}?token={ADMIN_TOKEN}", json=json_payload)
+    r = _session().post(f"{BACKEND_URL}{path}?token={ADMIN_TOKEN}", json=json_payload, timeout=HTTP_TIMEOUT)
     r.raise_for_status()
     return r.json()
 
@@ -31,6 +48,10 @@ class App(tk.Tk):
 
         self.tasks = []
         self.selected_task_id = None
+        # Bumped on every detail fetch; responses from older fetches are dropped.
+        self._detail_gen = 0
+        self._select_after = None
+        self._rendered_lines = ()
 
         self._build_ui()
         self.refresh_all()
@@ -88,20 +109,37 @@ class App(tk.Tk):
         self.detail_text.insert(tk.END, s)
 
     def refresh_all(self):
+        task_id = self.selected_task_id
+        self._detail_gen += 1
+        gen = self._detail_gen
+
         def worker():
             try:
-                tasks = api_get("/api/tasks")
-                self.tasks = tasks
-                self.after(0, self._render_tasks)
+                if task_id:
+                    # One round trip for the list and the selected run's detail.
+                    res = api_get(f"/api/tasks?detail_for={task_id}")
+                    self.tasks = res["tasks"]
+                    detail = res.get("detail")
+                    self.after(0, self._render_tasks)
+                    if detail:
+                        self.after(0, lambda: self._render_detail_if_current(gen, detail))
+                else:
+                    self.tasks = api_get("/api/tasks")
+                    self.after(0, self._render_tasks)
             except Exception as e:
                 self.after(0, lambda: messagebox.showerror("Error", str(e)))
-        threading.Thread(target=worker, daemon=True).start()
+        _EXEC.submit(worker)
 
     def _render_tasks(self):
+        lines = tuple(f"{t['status']:<16} {t['id'][:8]}  {t['mode']:<4}  {t['goal'][:40]}" for t in self.tasks)
+        # Unchanged list: leave the widget (and its selection) alone.
+        if lines == self._rendered_lines:
+            return
+        self._rendered_lines = lines
         self.task_list.delete(0, tk.END)
-        for t in self.tasks:
-            line = f"{t['status']:<16} {t['id'][:8]}  {t['mode']:<4}  {t['goal'][:40]}"
-            self.task_list.insert(tk.END, line)
+        # Single Tcl call for all rows.
+        if lines:
+            self.task_list.insert(tk.END, *lines)
 
     def on_select_task(self, event=None):
         sel = self.task_list.curselection()
@@ -110,16 +148,27 @@ class App(tk.Tk):
         idx = sel[0]
         task_id = self.tasks[idx]["id"]
         self.selected_task_id = task_id
-        self.load_task_detail(task_id)
+        # Debounce: arrow-key scrolling fires one event per row; only load where the selection settles.
+        if self._select_after is not None:
+            self.after_cancel(self._select_after)
+        self._select_after = self.after(150, lambda: self.load_task_detail(task_id))
 
     def load_task_detail(self, task_id: str):
+        self._select_after = None
+        self._detail_gen += 1
+        gen = self._detail_gen
+
         def worker():
             try:
                 detail = api_get(f"/api/tasks/{task_id}")
-                self.after(0, lambda: self._render_detail(detail))
+                self.after(0, lambda: self._render_detail_if_current(gen, detail))
             except Exception as e:
                 self.after(0, lambda: messagebox.showerror("Error", str(e)))
-        threading.Thread(target=worker, daemon=True).start()
+        _EXEC.submit(worker)
+
+    def _render_detail_if_current(self, gen: int, detail):
+        if gen == self._detail_gen:
+            self._render_detail(detail)
 
     def _render_detail(self, detail):
         task = detail["task"]
@@ -191,7 +240,7 @@ class App(tk.Tk):
                 self.after(0, self.refresh_all)
             except Exception as e:
                 self.after(0, lambda: messagebox.showerror("Error", str(e)))
-        threading.Thread(target=worker, daemon=True).start()
+        _EXEC.submit(worker)
 
     def show_ids(self):
         def worker():
@@ -202,7 +251,7 @@ class App(tk.Tk):
                 self.after(0, lambda: messagebox.showinfo("IDs", msg))
             except Exception as e:
                 self.after(0, lambda: messagebox.showerror("Error", str(e)))
-        threading.Thread(target=worker, daemon=True).start()
+        _EXEC.submit(worker)
 
 
 if __name__ == "__main__":
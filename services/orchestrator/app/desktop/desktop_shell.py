@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 import argparse
+import functools
+import itertools
 import os
 import socket
 import subprocess
 import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Set
 
 
 def _is_frozen() -> bool:
@@ -45,61 +48,94 @@ def _wait_http_ok(url: str, timeout_s: float = 20.0) -> None:
 
     deadline = time.time() + timeout_s
     last_err: Optional[BaseException] = None
+    # Exponential backoff: probe quickly while the backend boots, then back off to at most 0.8s.
+    delay = 0.025
+    attempt = 0
     while time.time() < deadline:
+        # Loopback refusals are instant; only allow a longer read once the server may be up.
+        per_try_timeout = 0.5 if attempt < 3 else 2.0
+        attempt += 1
         try:
-            with urllib.request.urlopen(url, timeout=2) as r:  # nosec - local loopback
+            with urllib.request.urlopen(url, timeout=per_try_timeout) as r:  # nosec - local loopback
                 if 200 <= int(getattr(r, "status", 200)) < 500:
                     return
         except BaseException as e:  # noqa: BLE001 - best-effort wait loop
             last_err = e
-        time.sleep(0.2)
+        time.sleep(delay)
+        delay = min(delay * 2, 0.8)
     raise RuntimeError(f"Backend did not become ready: {url}. Last error: {last_err}")
 
 
 def _default_product_data_root() -> Path:
     base = os.getenv("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
-    base_path = _short_path(Path(base))
-    return base_path / "OpenAgentWorkbench"
+    return Path(_short_path(base)) / "OpenAgentWorkbench"
 
 
-def _short_path(path: Path) -> Path:
+@functools.cache
+def _get_short_path_name_w() -> Any:
+    """Bind GetShortPathNameW once with its signature so ctypes does not re-marshal it per call."""
+    import ctypes
+    from ctypes import wintypes
+
+    fn = ctypes.windll.kernel32.GetShortPathNameW  # type: ignore[attr-defined]
+    fn.argtypes = (wintypes.LPCWSTR, wintypes.LPWSTR, wintypes.DWORD)
+    fn.restype = wintypes.DWORD
+    return fn
+
+
+@functools.lru_cache(maxsize=8)
+def _short_path(path_str: str) -> str:
     """
     Best-effort conversion to Windows 8.3 short paths.
     This avoids edge cases where some native components struggle with non-ASCII user profile paths.
     """
     if os.name != "nt":
-        return path
+        return path_str
     try:
         import ctypes
 
         buf = ctypes.create_unicode_buffer(4096)
-        res = ctypes.windll.kernel32.GetShortPathNameW(str(path), buf, len(buf))  # type: ignore[attr-defined]
+        res = _get_short_path_name_w()(path_str, buf, len(buf))
         if res and buf.value:
-            return Path(buf.value)
+            return buf.value
     except Exception:
-        return path
-    return path
+        return path_str
+    return path_str
+
+
+# .env candidates already known to be absent in this process.
+_missing_env_files: Set[str] = set()
 
 
 def _load_dotenv(path: Path) -> None:
-    if not path.exists():
+    key_path = str(path)
+    if key_path in _missing_env_files:
         return
-    for raw in path.read_text(encoding="utf-8").splitlines():
-        line = raw.strip()
-        if not line or line.startswith("#"):
-            continue
-        if "=" not in line:
-            continue
-        key, val = line.split("=", 1)
-        key = key.strip()
-        val = val.strip()
-        if not key:
-            continue
-        if (val.startswith('"') and val.endswith('"')) or (val.startswith("'") and val.endswith("'")):
-            val = val[1:-1]
-        # Do not override explicitly-set env vars.
-        if os.getenv(key) is None or os.getenv(key) == "":
-            os.environ[key] = val
+    # Open directly instead of exists() + open(): one syscall, and a miss is remembered.
+    try:
+        fd = os.open(key_path, os.O_RDONLY)
+    except FileNotFoundError:
+        _missing_env_files.add(key_path)
+        return
+    env = os.environ
+    # Iterate the file object so the whole .env is never held as one string plus a list of lines.
+    with open(fd, "r", encoding="utf-8", errors="replace") as f:
+        for raw in f:
+            line = raw.strip()
+            if not line or line.startswith("#"):
+                continue
+            if "=" not in line:
+                continue
+            key, val = line.split("=", 1)
+            key = key.strip()
+            val = val.strip()
+            if not key:
+                continue
+            if (val.startswith('"') and val.endswith('"')) or (val.startswith("'") and val.endswith("'")):
+                val = val[1:-1]
+            # Do not override explicitly-set env vars.
+            if not env.get(key):
+                env[key] = val
 
 
 def _ensure_desktop_env(orchestrator_dir: Path) -> None:
@@ -116,59 +152,79 @@ def _ensure_desktop_env(orchestrator_dir: Path) -> None:
         _load_dotenv(repo_root / ".env")
 
     # Store runtime data under AppData for the desktop build unless user overrides.
-    if not os.getenv("DATA_DIR"):
-        if _is_frozen():
-            data_root = _default_product_data_root()
-            os.environ["DATA_DIR"] = str((data_root / "data").resolve())
-        else:
-            if repo_root is None:
-                os.environ["DATA_DIR"] = str((Path.cwd() / "data").resolve())
-            else:
-                os.environ["DATA_DIR"] = str((repo_root / "data").resolve())
-
-    data_dir = Path(os.environ["DATA_DIR"]).resolve()
+    env = os.environ
+    if env.get("DATA_DIR"):
+        data_dir = Path(env["DATA_DIR"])
+    elif _is_frozen():
+        data_dir = _default_product_data_root() / "data"
+    elif repo_root is None:
+        data_dir = Path.cwd() / "data"
+    else:
+        data_dir = repo_root / "data"
+    # Resolve once; every default below is a plain child of this absolute path.
+    data_dir = data_dir.resolve()
+    data_s = str(data_dir)
+    env["DATA_DIR"] = data_s
     # Ensure folders exist before the backend initializes SQLite/WAL files.
     data_dir.mkdir(parents=True, exist_ok=True)
-    os.environ.setdefault("DB_PATH", str((data_dir / "workbench.db").resolve()))
-    os.environ.setdefault("WORKSPACES_DIR", str((data_dir / "workspaces").resolve()))
-    os.environ.setdefault("ARTIFACTS_DIR", str((data_dir / "artifacts").resolve()))
-    os.environ.setdefault("LOGS_DIR", str((data_dir / "logs").resolve()))
+    _apply_env_defaults(
+        env,
+        {
+            "DB_PATH": data_s + os.sep + "workbench.db",
+            "WORKSPACES_DIR": data_s + os.sep + "workspaces",
+            "ARTIFACTS_DIR": data_s + os.sep + "artifacts",
+            "LOGS_DIR": data_s + os.sep + "logs",
+        },
+    )
 
-    Path(os.environ["WORKSPACES_DIR"]).mkdir(parents=True, exist_ok=True)
-    Path(os.environ["ARTIFACTS_DIR"]).mkdir(parents=True, exist_ok=True)
-    Path(os.environ["LOGS_DIR"]).mkdir(parents=True, exist_ok=True)
-    Path(os.environ["DB_PATH"]).resolve().parent.mkdir(parents=True, exist_ok=True)
+    # Defaults sit directly under data_dir (which now exists), so a single-level mkdir is enough;
+    # only user overrides elsewhere need the full parents walk.
+    for sub in (
+        Path(env["WORKSPACES_DIR"]),
+        Path(env["ARTIFACTS_DIR"]),
+        Path(env["LOGS_DIR"]),
+        Path(env["DB_PATH"]).parent,
+    ):
+        if sub == data_dir:
+            continue
+        sub.mkdir(parents=sub.parent != data_dir, exist_ok=True)
 
     # Apply persisted runtime env (provider + desktop settings) if present.
     _apply_runtime_env_json(data_dir)
 
     # Skills location: bundle into the .exe, fall back to repo ./skills.
-    if not os.getenv("SKILLS_DIR"):
-        if _is_frozen() and _meipass():
-            bundled = _meipass() / "skills"
-            os.environ["SKILLS_DIR"] = str(bundled.resolve())
-        else:
-            if repo_root is None:
-                os.environ["SKILLS_DIR"] = str((Path.cwd() / "skills").resolve())
-            else:
-                os.environ["SKILLS_DIR"] = str((repo_root / "skills").resolve())
-
-    # Desktop app should bind to loopback only.
-    os.environ.setdefault("APP_HOST", "127.0.0.1")
-    os.environ.setdefault("OWB_DESKTOP", "1")
-
-    # Store Playwright browsers under the product data directory so installs persist across updates.
-    # (Only used by the browser tool; download happens on-demand.)
-    try:
-        data_dir = Path(os.environ["DATA_DIR"]).resolve()
-        os.environ.setdefault("PLAYWRIGHT_BROWSERS_PATH", str((data_dir / "playwright-browsers").resolve()))
-    except Exception:
-        pass
+    if _is_frozen() and _meipass():
+        skills_dir = _meipass() / "skills"
+    elif repo_root is None:
+        skills_dir = Path.cwd() / "skills"
+    else:
+        skills_dir = repo_root / "skills"
+
+    _apply_env_defaults(
+        env,
+        {
+            "SKILLS_DIR": str(skills_dir.resolve()),
+            # Desktop app should bind to loopback only.
+            "APP_HOST": "127.0.0.1",
+            "OWB_DESKTOP": "1",
+            # Store Playwright browsers under the product data directory so installs persist across updates.
+            # (Only used by the browser tool; download happens on-demand.)
+            "PLAYWRIGHT_BROWSERS_PATH": data_s + os.sep + "playwright-browsers",
+        },
+    )
 
     # If user copied .env.example, it may contain the docker-internal LiteLLM URL.
     # In desktop/local mode, default to 0-0.pro unless overridden.
-    if not os.getenv("OPENAI_BASE_URL") or os.getenv("OPENAI_BASE_URL") == "http://litellm:4000/v1":
-        os.environ["OPENAI_BASE_URL"] = "https://0-0.pro/v1"
+    base_url = env.get("OPENAI_BASE_URL")
+    if not base_url or base_url == "http://litellm:4000/v1":
+        env["OPENAI_BASE_URL"] = "https://0-0.pro/v1"
+
+
+def _apply_env_defaults(env: Any, defaults: Dict[str, str]) -> None:
+    # Each os.environ write is a putenv(); only touch keys that are missing or empty.
+    for key, val in defaults.items():
+        if not env.get(key):
+            env[key] = val
 
 
 def _webview2_installed() -> bool:
@@ -182,16 +238,10 @@ def _webview2_installed() -> bool:
         import winreg
 
         # Require .NET >= 4.6.2 (matches pywebview's winforms check).
-        net_key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\NET Framework Setup\NDP\v4\Full")
-        try:
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\NET Framework Setup\NDP\v4\Full") as net_key:
             version, _ = winreg.QueryValueEx(net_key, "Release")
-            if int(version or 0) < 394802:
-                return False
-        finally:
-            try:
-                winreg.CloseKey(net_key)
-            except Exception:
-                pass
+        if int(version or 0) < 394802:
+            return False
 
         def _parse_ver(v: str) -> tuple[int, int, int, int]:
             parts = [p for p in str(v or "").split(".") if p.strip().isdigit()]
@@ -200,42 +250,33 @@ def _webview2_installed() -> bool:
                 nums.append(0)
             return nums[0], nums[1], nums[2], nums[3]
 
-        def _ge(a: str, b: str) -> bool:
-            return _parse_ver(a) >= _parse_ver(b)
+        min_ver = _parse_ver("86.0.622.0")
 
-        # WebView2 Runtime registry IDs (same as pywebview).
+        # WebView2 Runtime registry IDs (same as pywebview); the stable Runtime comes first.
         candidates = [
             "{F3017226-FE2A-4295-8BDF-00C3A9A7E4C5}",  # Runtime
             "{2CD8A007-E189-409D-A2C8-9AF4EF3C72AA}",  # Beta
             "{0D50BFEC-CD6A-4F9A-964C-C7416E3ACB10}",  # Dev
             "{65C35B14-6C1D-4122-AC46-7148CC9D6497}",  # Canary
         ]
-        min_ver = "86.0.622.0"
-
-        for key in candidates:
-            for root_name in ("HKEY_CURRENT_USER", "HKEY_LOCAL_MACHINE"):
-                root = getattr(winreg, root_name)
-                # pywebview checks WOW6432Node for non-x86. Keep both for robustness.
-                paths = [
-                    rf"SOFTWARE\Microsoft\EdgeUpdate\Clients\{key}",
-                    rf"SOFTWARE\WOW6432Node\Microsoft\EdgeUpdate\Clients\{key}",
-                ]
-                for p in paths:
-                    try:
-                        reg = winreg.OpenKey(root, p)
-                    except Exception:
-                        continue
-                    try:
-                        ver, _ = winreg.QueryValueEx(reg, "pv")
-                        if isinstance(ver, str) and _ge(ver, min_ver):
-                            return True
-                    except Exception:
-                        pass
-                    finally:
-                        try:
-                            winreg.CloseKey(reg)
-                        except Exception:
-                            pass
+        # Most likely locations first: per-machine installs (under WOW6432Node on 64-bit Windows),
+        # then per-user. pywebview checks WOW6432Node for non-x86; keep both views for robustness.
+        locations = [
+            (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Microsoft\EdgeUpdate\Clients\{}"),
+            (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\EdgeUpdate\Clients\{}"),
+            (winreg.HKEY_CURRENT_USER, r"SOFTWARE\Microsoft\EdgeUpdate\Clients\{}"),
+            (winreg.HKEY_CURRENT_USER, r"SOFTWARE\WOW6432Node\Microsoft\EdgeUpdate\Clients\{}"),
+        ]
+
+        # Single pass; the first hit returns.
+        for key, (root, path_fmt) in itertools.product(candidates, locations):
+            try:
+                with winreg.OpenKey(root, path_fmt.format(key)) as reg:
+                    ver, _ = winreg.QueryValueEx(reg, "pv")
+            except OSError:
+                continue
+            if isinstance(ver, str) and _parse_ver(ver) >= min_ver:
+                return True
     except Exception:
         # If detection fails, don't block startup; pywebview will still try.
         return True
@@ -268,8 +309,63 @@ def _open_url(url: str) -> None:
         pass
 
 
+WEBVIEW2_BOOTSTRAPPER_URL = "https://go.microsoft.com/fwlink/p/?LinkId=2124703"
+
+
+def _download_file(url: str, dest: Path, *, attempts: int = 4) -> None:
+    """
+    Stream `url` into `dest` with 1 MiB writes. The file only appears once complete (tmp + replace),
+    so an interrupted download never leaves a truncated installer behind.
+    """
+    import shutil
+    import urllib.request
+
+    tmp = dest.with_name(dest.name + ".part")
+    delay = 0.5
+    for attempt in range(attempts):
+        try:
+            with urllib.request.urlopen(url, timeout=30) as r, open(tmp, "wb") as f:  # nosec - trusted MS URL
+                shutil.copyfileobj(r, f, 1024 * 1024)
+            os.replace(tmp, dest)
+            return
+        except OSError:
+            try:
+                tmp.unlink(missing_ok=True)
+            except OSError:
+                pass
+            if attempt + 1 >= attempts:
+                raise
+            # Back off 0.5s, 1s, 2s to ride out transient CDN failures.
+            time.sleep(delay)
+            delay *= 2
+
+
+# Positive WebView2 detections are remembered for a week to skip the registry sweep on launch.
+WEBVIEW2_MARKER_MAX_AGE_S = 7 * 86400
+
+
+def _webview2_marker() -> Path:
+    return Path(os.getenv("DATA_DIR", str(Path.cwd() / "data"))).resolve() / "webview2.ok"
+
+
+def _webview2_installed_cached() -> bool:
+    marker = _webview2_marker()
+    try:
+        if time.time() - marker.stat().st_mtime < WEBVIEW2_MARKER_MAX_AGE_S:
+            return True
+    except OSError:
+        pass
+    if not _webview2_installed():
+        return False
+    try:
+        marker.touch()
+    except OSError:
+        pass
+    return True
+
+
 def _ensure_webview2_or_install() -> None:
-    if _webview2_installed():
+    if _webview2_installed_cached():
         return
 
     title = "OpenAgent Workbench"
@@ -291,9 +387,13 @@ def _ensure_webview2_or_install() -> None:
         data_dir.mkdir(parents=True, exist_ok=True)
         setup_path = data_dir / "MicrosoftEdgeWebView2Setup.exe"
         if not setup_path.exists():
-            import urllib.request
+            _download_file(WEBVIEW2_BOOTSTRAPPER_URL, setup_path)
 
-            urllib.request.urlretrieve("https://go.microsoft.com/fwlink/p/?LinkId=2124703", str(setup_path))  # nosec - trusted MS URL
+    # Running the installer means the runtime state is changing; never trust an old marker afterwards.
+    try:
+        _webview2_marker().unlink(missing_ok=True)
+    except OSError:
+        pass
 
     try:
         popen_kwargs: Dict[str, Any] = {}
@@ -319,16 +419,16 @@ def _ensure_webview2_or_install() -> None:
             text=f"无法启动 WebView2 安装程序：{e}\n\n请手动安装后再启动应用。",
             flags=0x00 | 0x10,  # MB_OK | MB_ICONERROR
         )
-        _open_url("https://go.microsoft.com/fwlink/p/?LinkId=2124703")
+        _open_url(WEBVIEW2_BOOTSTRAPPER_URL)
         raise RuntimeError("WebView2 Runtime install failed.") from e
 
-    if not _webview2_installed():
+    if not _webview2_installed_cached():
         _message_box(
             title=title,
             text="WebView2 安装完成后仍未检测到可用运行时。\n\n请重启电脑后再启动应用，或手动安装 Evergreen Runtime。",
             flags=0x00 | 0x30,  # MB_OK | MB_ICONWARNING
         )
-        _open_url("https://go.microsoft.com/fwlink/p/?LinkId=2124703")
+        _open_url(WEBVIEW2_BOOTSTRAPPER_URL)
         raise RuntimeError("WebView2 Runtime is required.")
 
 
@@ -354,23 +454,41 @@ def _ensure_admin_token() -> str:
     return token
 
 
+# runtime_env.json path -> (st_mtime_ns, parsed str->str entries)
+_runtime_env_cache: Dict[str, tuple[int, Dict[str, str]]] = {}
+
+
 def _apply_runtime_env_json(data_dir: Path) -> None:
     p = data_dir / "runtime_env.json"
-    if not p.exists():
-        return
+    key_path = str(p)
     try:
-        import json
+        mtime_ns = p.stat().st_mtime_ns
+    except OSError:
+        return
+    cached = _runtime_env_cache.get(key_path)
+    if cached is not None and cached[0] == mtime_ns:
+        entries = cached[1]
+    else:
+        try:
+            raw = p.read_bytes()
+            try:
+                import orjson
+
+                data = orjson.loads(raw)
+            except ImportError:
+                import json
 
-        data = json.loads(p.read_text(encoding="utf-8"))
-        if not isinstance(data, dict):
+                data = json.loads(raw.decode("utf-8"))
+            if not isinstance(data, dict):
+                return
+        except Exception:
             return
-    except Exception:
-        return
-    for k, v in data.items():
-        if not isinstance(k, str) or not isinstance(v, str):
-            continue
-        if os.getenv(k) is None or os.getenv(k) == "":
-            os.environ[k] = v
+        entries = {k: v for k, v in data.items() if type(k) is str and type(v) is str}
+        _runtime_env_cache[key_path] = (mtime_ns, entries)
+    env = os.environ
+    for k, v in entries.items():
+        if not env.get(k):
+            env[k] = v
 
 
 def _ensure_window_icon_file() -> Optional[str]:
@@ -379,12 +497,13 @@ def _ensure_window_icon_file() -> Optional[str]:
     pywebview expects a real file path on Windows (even in onefile builds).
     """
     try:
-        from .icon_assets import write_ico
+        from .icon_assets import icon_fingerprint, write_ico
 
+        # DATA_DIR was created by _ensure_desktop_env; write_ico creates it if it had to render anyway.
         data_dir = Path(os.getenv("DATA_DIR", str(Path.cwd() / "data"))).resolve()
-        data_dir.mkdir(parents=True, exist_ok=True)
         icon_path = data_dir / "app-icon.ico"
-        write_ico(icon_path)
+        # Artwork is deterministic: only re-render when the palette/drawing version changed.
+        write_ico(icon_path, fingerprint=icon_fingerprint())
         return str(icon_path)
     except Exception:
         return None
@@ -415,15 +534,25 @@ def _start_backend_subprocess(orchestrator_dir: Path, port: int) -> subprocess.P
     except Exception:
         pass
 
-    return subprocess.Popen(  # noqa: S603 - intended local child process
-        cmd,
-        cwd=cwd,
-        # Append so users keep historical logs for debugging (do not truncate on every launch).
-        stdout=stdout_path.open("a", encoding="utf-8"),
-        stderr=stderr_path.open("a", encoding="utf-8"),
-        env=env,
-        creationflags=creationflags,
-    )
+    # Append so users keep historical logs for debugging (do not truncate on every launch).
+    # Raw fds: the child inherits duplicates, so the parent closes its copies right after spawning.
+    log_flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+    out_fd = os.open(str(stdout_path), log_flags, 0o644)
+    try:
+        err_fd = os.open(str(stderr_path), log_flags, 0o644)
+        try:
+            return subprocess.Popen(  # noqa: S603 - intended local child process
+                cmd,
+                cwd=cwd,
+                stdout=out_fd,
+                stderr=err_fd,
+                env=env,
+                creationflags=creationflags,
+            )
+        finally:
+            os.close(err_fd)
+    finally:
+        os.close(out_fd)
 
 
 def _backend_main(port: int) -> None:
@@ -473,17 +602,70 @@ def _backend_main(port: int) -> None:
             # If we can't check reliably, do not terminate.
             return True
 
+    def _parent_gone() -> None:
+        try:
+            sys.stderr.write(f"[owb] parent process {parent_pid} exited; stopping backend\n")
+            sys.stderr.flush()
+        except Exception:
+            pass
+        os._exit(0)
+
+    def _blocking_parent_wait() -> Optional[Any]:
+        """
+        Return a callable that blocks until the parent exits, or None if the platform offers no such wait.
+        """
+        if os.name == "nt":
+            try:
+                import ctypes
+                from ctypes import wintypes
+
+                kernel32 = ctypes.windll.kernel32  # type: ignore[attr-defined]
+                kernel32.OpenProcess.restype = wintypes.HANDLE
+                kernel32.WaitForSingleObject.argtypes = (wintypes.HANDLE, wintypes.DWORD)
+                kernel32.WaitForSingleObject.restype = wintypes.DWORD
+                SYNCHRONIZE = 0x00100000
+                handle = kernel32.OpenProcess(SYNCHRONIZE, 0, parent_pid)
+                if not handle:
+                    return None
+                INFINITE = 0xFFFFFFFF
+                WAIT_OBJECT_0 = 0
+                return lambda: kernel32.WaitForSingleObject(handle, INFINITE) == WAIT_OBJECT_0
+            except Exception:
+                return None
+        # PR_SET_PDEATHSIG tracks the spawning *thread* (after_start runs on a short-lived pywebview thread),
+        # so wait on a pidfd instead: it becomes readable exactly when the parent process exits.
+        pidfd_open = getattr(os, "pidfd_open", None)
+        if pidfd_open is None:
+            return None
+        try:
+            fd = pidfd_open(parent_pid)
+        except OSError:
+            return None
+
+        def _wait() -> bool:
+            import select
+
+            select.select([fd], [], [])
+            return True
+
+        return _wait
+
     if parent_pid > 0:
+        wait_parent = _blocking_parent_wait()
+
         def _watch_parent() -> None:
+            if wait_parent is not None:
+                # Zero wakeups until the parent actually exits.
+                try:
+                    if wait_parent():
+                        _parent_gone()
+                except Exception:
+                    pass
+            # Fallback for platforms without a blocking process wait.
             while True:
                 try:
                     if not _pid_is_running(parent_pid):
-                        try:
-                            sys.stderr.write(f"[owb] parent process {parent_pid} exited; stopping backend\n")
-                            sys.stderr.flush()
-                        except Exception:
-                            pass
-                        os._exit(0)
+                        _parent_gone()
                 except Exception:
                     pass
                 time.sleep(2.0)
@@ -497,11 +679,13 @@ def _backend_main(port: int) -> None:
         sys.stderr.flush()
     except Exception:
         pass
+    host = os.getenv("APP_HOST", "127.0.0.1")
+    os.environ["APP_PORT"] = str(port)
+
+    # Heavy imports go last, once the parent watcher is armed and the env is final.
     # Run uvicorn in-process for the backend child mode.
     import uvicorn
 
-    host = os.getenv("APP_HOST", "127.0.0.1")
-    os.environ["APP_PORT"] = str(port)
     # Import explicitly so PyInstaller can see the dependency (uvicorn string import is dynamic).
     from app.main import app as asgi_app
 
@@ -511,7 +695,7 @@ def _backend_main(port: int) -> None:
 def _create_tray_icon(window, backend_proc: Optional[subprocess.Popen], start_url: str):
     try:
         import pystray
-        from PIL import Image
+        from PIL import Image, ImageDraw
     except Exception:  # noqa: BLE001 - optional dependency
         return None
 
@@ -523,9 +707,7 @@ def _create_tray_icon(window, backend_proc: Optional[subprocess.Popen], start_ur
         except Exception:
             # Fallback: simple dot icon
             img = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
-            for y in range(16, 48):
-                for x in range(16, 48):
-                    img.putpixel((x, y), (14, 165, 233, 255))
+            ImageDraw.Draw(img).rectangle((16, 16, 47, 47), fill=(14, 165, 233, 255))
             return img
 
     def _show(_icon, _item):
@@ -621,9 +803,20 @@ def _desktop_main() -> int:
         _backend_main(port)
         return 0
 
-    token = _ensure_admin_token()
-    window_icon = _ensure_window_icon_file()
-    _ensure_webview2_or_install()
+    # Icon rendering and token I/O are independent of the WebView2 check; overlap them.
+    ex = ThreadPoolExecutor(max_workers=2, thread_name_prefix="desktop-init")
+    try:
+        fut_icon = ex.submit(_ensure_window_icon_file)
+        fut_tok = ex.submit(_ensure_admin_token)
+        _ensure_webview2_or_install()
+        token = fut_tok.result()
+        try:
+            # A hung icon render must not hold up the window; pywebview falls back to its default icon.
+            window_icon = fut_icon.result(timeout=5)
+        except Exception:  # noqa: BLE001
+            window_icon = None
+    finally:
+        ex.shutdown(wait=False)
 
     try:
         import webview
@@ -643,9 +836,24 @@ def _desktop_main() -> int:
 
     backend_proc: Optional[subprocess.Popen] = None
     tray_icon = None
+    tray_lock = threading.Lock()
+    shutting_down = False
+
+    def _bind_tray(icon) -> None:
+        nonlocal tray_icon
+        with tray_lock:
+            if not shutting_down:
+                tray_icon = icon
+                return
+        # The window closed while the tray was still being built.
+        try:
+            if icon is not None:
+                icon.stop()
+        except Exception:  # noqa: BLE001
+            pass
 
     def after_start():
-        nonlocal backend_proc, tray_icon
+        nonlocal backend_proc
         host_mode = (os.getenv("OWB_HOST_MODE") or "local").strip().lower()
         remote_url = (os.getenv("OWB_REMOTE_URL") or "").strip()
         remote_token = (os.getenv("OWB_REMOTE_TOKEN") or "").strip() or token
@@ -668,7 +876,12 @@ def _desktop_main() -> int:
         except Exception:  # noqa: BLE001
             pass
 
-        tray_icon = _create_tray_icon(main_window, backend_proc, start_url)
+        # pystray/PIL imports are slow; build the tray off-thread so it overlaps first paint.
+        proc = backend_proc
+        threading.Thread(
+            target=lambda: _bind_tray(_create_tray_icon(main_window, proc, start_url)),
+            daemon=True,
+        ).start()
 
         close_to_tray = (os.getenv("OWB_CLOSE_TO_TRAY") or "").strip() == "1"
         if close_to_tray:
@@ -695,6 +908,8 @@ def _desktop_main() -> int:
         except Exception:
             webview.start(after_start, debug=False, icon=window_icon)
     finally:
+        with tray_lock:
+            shutting_down = True
         try:
             if tray_icon is not None:
                 tray_icon.stop()
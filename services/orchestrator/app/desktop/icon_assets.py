@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import argparse
+import functools
+import hashlib
+import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Tuple
+from typing import Optional, Tuple
 
+import numpy as np
 from PIL import Image, ImageFilter
 
 
@@ -23,54 +27,70 @@ class Palette:
     text: RGB = (230, 230, 230)     # #e6e6e6
 
 
-def _put(img: Image.Image, x: int, y: int, c: RGB) -> None:
-    if 0 <= x < img.width and 0 <= y < img.height:
-        img.putpixel((x, y), c)
+def _rect(arr: np.ndarray, x0: int, y0: int, x1: int, y1: int, c: RGB) -> None:
+    # Inclusive bounds, clipped to the canvas (out-of-range pixels are silently skipped).
+    h, w = arr.shape[:2]
+    xa, xb = max(0, x0), min(w - 1, x1)
+    ya, yb = max(0, y0), min(h - 1, y1)
+    if xa <= xb and ya <= yb:
+        arr[ya : yb + 1, xa : xb + 1] = c
 
 
-def _hline(img: Image.Image, x0: int, x1: int, y: int, c: RGB) -> None:
-    for x in range(x0, x1 + 1):
-        _put(img, x, y, c)
+def _put(arr: np.ndarray, x: int, y: int, c: RGB) -> None:
+    _rect(arr, x, y, x, y, c)
 
 
-def _vline(img: Image.Image, x: int, y0: int, y1: int, c: RGB) -> None:
-    for y in range(y0, y1 + 1):
-        _put(img, x, y, c)
+def _hline(arr: np.ndarray, x0: int, x1: int, y: int, c: RGB) -> None:
+    _rect(arr, x0, y, x1, y, c)
 
 
-def _rect(img: Image.Image, x0: int, y0: int, x1: int, y1: int, c: RGB) -> None:
-    for y in range(y0, y1 + 1):
-        _hline(img, x0, x1, y, c)
+def _vline(arr: np.ndarray, x: int, y0: int, y1: int, c: RGB) -> None:
+    _rect(arr, x, y0, x, y1, c)
 
 
-def _frame(img: Image.Image, x0: int, y0: int, x1: int, y1: int, c: RGB) -> None:
-    _hline(img, x0, x1, y0, c)
-    _hline(img, x0, x1, y1, c)
-    _vline(img, x0, y0, y1, c)
-    _vline(img, x1, y0, y1, c)
+def _frame(arr: np.ndarray, x0: int, y0: int, x1: int, y1: int, c: RGB) -> None:
+    _hline(arr, x0, x1, y0, c)
+    _hline(arr, x0, x1, y1, c)
+    _vline(arr, x0, y0, y1, c)
+    _vline(arr, x1, y0, y1, c)
+
+
+# Pixel "A" glyph as a (rows, cols) mask, blitted with one boolean-index write.
+_A_MASK = np.array(
+    [
+        [0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 1, 0, 0, 0],
+        [0, 0, 1, 1, 1, 0, 0],
+        [0, 1, 0, 1, 0, 1, 0],
+        [1, 1, 1, 1, 1, 1, 1],
+    ],
+    dtype=bool,
+)
 
 
 def _draw_pixel_art(size: int = 32, pal: Palette | None = None) -> Image.Image:
     pal = pal or Palette()
-    img = Image.new("RGB", (size, size), pal.bg)
+    # Draw into an RGB buffer with slice assignments, then hand PIL a single array.
+    arr = np.empty((size, size, 3), dtype=np.uint8)
+    arr[...] = pal.bg
 
     # Outer neon frame (pixel-y, with tech gaps)
-    _frame(img, 1, 1, size - 2, size - 2, pal.border)
-    for i in range(3, size - 3, 6):
-        _put(img, i, 1, pal.neon)
-        _put(img, i + 1, 1, pal.neon2)
-        _put(img, size - 2, i, pal.neon)
-        _put(img, size - 2, i + 1, pal.neon2)
+    _frame(arr, 1, 1, size - 2, size - 2, pal.border)
+    ticks = np.arange(3, size - 3, 6)
+    arr[1, ticks] = pal.neon
+    arr[1, ticks + 1] = pal.neon2
+    arr[ticks, size - 2] = pal.neon
+    arr[ticks + 1, size - 2] = pal.neon2
 
     # Inner panel
-    _rect(img, 3, 3, size - 4, size - 4, pal.panel)
-    _frame(img, 3, 3, size - 4, size - 4, pal.border)
+    _rect(arr, 3, 3, size - 4, size - 4, pal.panel)
+    _frame(arr, 3, 3, size - 4, size - 4, pal.border)
 
     # Top bar with 3 status pixels
-    _rect(img, 4, 4, size - 5, 7, pal.panel2)
-    _put(img, 6, 6, pal.neon)
-    _put(img, 8, 6, pal.purple)
-    _put(img, 10, 6, pal.neon2)
+    _rect(arr, 4, 4, size - 5, 7, pal.panel2)
+    _put(arr, 6, 6, pal.neon)
+    _put(arr, 8, 6, pal.purple)
+    _put(arr, 10, 6, pal.neon2)
 
     # Center "A" badge (hex-ish)
     cx, cy = size // 2, size // 2 + 1
@@ -78,42 +98,40 @@ def _draw_pixel_art(size: int = 32, pal: Palette | None = None) -> Image.Image:
         (cx - 6, cy - 4, cx + 6, cy + 4),
     ]
     for (x0, y0, x1, y1) in badge:
-        _rect(img, x0, y0, x1, y1, pal.panel2)
-        _frame(img, x0, y0, x1, y1, pal.neon)
-        _put(img, x0 + 1, y0 + 1, pal.neon2)
-        _put(img, x1 - 1, y1 - 1, pal.neon2)
+        _rect(arr, x0, y0, x1, y1, pal.panel2)
+        _frame(arr, x0, y0, x1, y1, pal.neon)
+        _put(arr, x0 + 1, y0 + 1, pal.neon2)
+        _put(arr, x1 - 1, y1 - 1, pal.neon2)
 
     # Pixel "A" inside
     ax0, ay0 = cx - 3, cy - 2
-    a_pixels: Iterable[Tuple[int, int]] = [
-        (0, 4),
-        (1, 3), (1, 4),
-        (2, 2), (2, 4),
-        (3, 1), (3, 2), (3, 3), (3, 4),
-        (4, 2), (4, 4),
-        (5, 3), (5, 4),
-        (6, 4),
-    ]
-    for px, py in a_pixels:
-        _put(img, ax0 + px, ay0 + py, pal.text)
+    region = arr[max(0, ay0) : ay0 + _A_MASK.shape[0], max(0, ax0) : ax0 + _A_MASK.shape[1]]
+    if region.shape[:2] == _A_MASK.shape:
+        region[_A_MASK] = pal.text
 
     # Circuit traces at bottom
-    _hline(img, 6, size - 7, size - 8, pal.border)
-    _put(img, 8, size - 8, pal.neon)
-    _put(img, size - 9, size - 8, pal.neon2)
-    _vline(img, 8, size - 8, size - 6, pal.border)
-    _vline(img, size - 9, size - 8, size - 6, pal.border)
-    _put(img, 8, size - 6, pal.neon)
-    _put(img, size - 9, size - 6, pal.neon2)
+    _hline(arr, 6, size - 7, size - 8, pal.border)
+    _put(arr, 8, size - 8, pal.neon)
+    _put(arr, size - 9, size - 8, pal.neon2)
+    _vline(arr, 8, size - 8, size - 6, pal.border)
+    _vline(arr, size - 9, size - 8, size - 6, pal.border)
+    _put(arr, 8, size - 6, pal.neon)
+    _put(arr, size - 9, size - 6, pal.neon2)
+
+    return Image.fromarray(arr)
+
 
-    return img
+@functools.lru_cache(maxsize=1)
+def _base_art() -> Image.Image:
+    # The palette is frozen, so the 32px master never changes. Callers only resize it (resize copies).
+    return _draw_pixel_art(32)
 
 
 def icon_image(size: int = 64) -> "Image.Image":
     """
     Generate an original pixel-art sci‑fi icon at the requested size.
     """
-    base = _draw_pixel_art(32)
+    base = _base_art()
     out = base.resize((size, size), resample=Image.Resampling.NEAREST)
     # Subtle glow overlay for larger sizes
     if size >= 96:
@@ -122,17 +140,59 @@ def icon_image(size: int = 64) -> "Image.Image":
     return out.convert("RGBA")
 
 
-def write_png(path: Path, size: int = 256) -> Path:
+# Bump when the drawing code changes so cached icon files are regenerated.
+ICON_VERSION = "v2"
+
+
+def icon_fingerprint() -> str:
+    """
+    Identify the rendered artwork (palette + drawing version) for on-disk caching.
+    """
+    return hashlib.blake2b(repr(Palette()).encode("utf-8") + ICON_VERSION.encode("ascii"), digest_size=8).hexdigest()
+
+
+def _ver_path(path: Path) -> Path:
+    return path.with_name(path.name + ".ver")
+
+
+def _is_current(path: Path, fingerprint: Optional[str]) -> bool:
+    if not fingerprint:
+        return False
+    try:
+        return path.exists() and _ver_path(path).read_text(encoding="utf-8").strip() == fingerprint
+    except OSError:
+        return False
+
+
+def _mark_current(path: Path, fingerprint: Optional[str]) -> None:
+    if not fingerprint:
+        return
+    ver = _ver_path(path)
+    tmp = ver.with_name(ver.name + ".tmp")
+    tmp.write_text(fingerprint, encoding="utf-8")
+    os.replace(tmp, ver)
+
+
+def write_png(path: Path, size: int = 256, fingerprint: Optional[str] = None) -> Path:
+    # With a fingerprint, an existing file rendered from the same artwork is reused as-is.
+    if _is_current(path, fingerprint):
+        return path
     path.parent.mkdir(parents=True, exist_ok=True)
     icon_image(size=size).save(path, format="PNG")
+    _mark_current(path, fingerprint)
     return path
 
 
-def write_ico(path: Path) -> Path:
+def write_ico(path: Path, fingerprint: Optional[str] = None) -> Path:
+    # With a fingerprint, an existing file rendered from the same artwork is reused as-is.
+    if _is_current(path, fingerprint):
+        return path
     path.parent.mkdir(parents=True, exist_ok=True)
     sizes = [(16, 16), (24, 24), (32, 32), (48, 48), (64, 64), (128, 128), (256, 256)]
-    base = icon_image(size=256)
-    base.save(path, format="ICO", sizes=sizes)
+    # Render every size from the pixel master (NEAREST) instead of letting PIL downsample the 256px frame.
+    imgs = [icon_image(size=w) for w, _ in sizes]
+    imgs[-1].save(path, format="ICO", sizes=sizes, append_images=imgs[:-1])
+    _mark_current(path, fingerprint)
     return path
 
 
@@ -1,49 +1,168 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import queue
 import threading
 import time
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
+try:
+    import orjson
+except Exception:  # optional speedup; stdlib json is the fallback
+    orjson = None  # type: ignore[assignment]
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Event:
     type: str
     data: Dict[str, Any]
     ts: float
+    # Encoded SSE frame, built once by emit() and shared by every subscriber.
+    frame: Optional[bytes] = field(default=None, repr=False, compare=False)
+
+
+# Per-subscriber backlog bound: a stalled SSE client cannot pin more than this many events.
+SUBSCRIBER_MAXLEN = 512
+
+
+class SubscriberChannel:
+    """
+    Single-consumer event channel: a bounded deque plus a wake-up flag.
+    deque.append/popleft are atomic, so publishers never take a lock or notify a Condition.
+    On overflow the oldest events are dropped and the consumer sees one "overflow" event first.
+    Consumers either block a thread in get() or await aget() on an event loop.
+    """
+
+    __slots__ = ("_items", "_ready", "_dropped", "_waiter")
+
+    def __init__(self, maxlen: int = SUBSCRIBER_MAXLEN) -> None:
+        self._items: Deque[Event] = deque(maxlen=maxlen)
+        self._ready = threading.Event()
+        self._dropped = 0
+        # (loop, future) of a parked aget(); publishers resolve it via call_soon_threadsafe.
+        self._waiter: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = None
+
+    def put_nowait(self, ev: Event) -> None:
+        if len(self._items) == self._items.maxlen:
+            # Best-effort count; deque(maxlen) discards the oldest entry on append.
+            self._dropped += 1
+        self._items.append(ev)
+        self._ready.set()
+        waiter = self._waiter
+        if waiter is not None:
+            loop, fut = waiter
+            loop.call_soon_threadsafe(_resolve, fut)
+
+    def _pop(self) -> Optional[Event]:
+        dropped = self._dropped
+        if dropped:
+            self._dropped = 0
+            return Event(type="overflow", data={"dropped": dropped}, ts=time.time())
+        try:
+            return self._items.popleft()
+        except IndexError:
+            return None
+
+    def get(self, timeout: Optional[float] = None) -> Event:
+        while True:
+            ev = self._pop()
+            if ev is not None:
+                return ev
+            self._ready.clear()
+            # Re-check after clearing so an append racing with clear() is not missed.
+            if self._items:
+                continue
+            if not self._ready.wait(timeout):
+                raise queue.Empty
 
+    async def aget(self) -> Event:
+        # Parks on a future instead of holding an executor thread per waiting subscriber.
+        loop = asyncio.get_running_loop()
+        while True:
+            ev = self._pop()
+            if ev is not None:
+                return ev
+            fut = loop.create_future()
+            self._waiter = (loop, fut)
+            try:
+                # Re-check after publishing the waiter so an append racing with it is not missed.
+                if not self._items and not self._dropped:
+                    await fut
+            finally:
+                self._waiter = None
 
-# Thread-safe subscriber queues
-_subscribers: List["queue.Queue[Event]"] = []
-_lock = threading.Lock()
 
+def _resolve(fut: asyncio.Future) -> None:
+    if not fut.done():
+        fut.set_result(None)
 
-def subscribe() -> "queue.Queue[Event]":
-    q: "queue.Queue[Event]" = queue.Queue()
-    with _lock:
-        _subscribers.append(q)
+
+# Subscriber queues, sharded and copy-on-write: each shard's tuple is only rebuilt (under that shard's lock)
+# on subscribe/unsubscribe, so emit() reads the snapshots without locking and membership changes on
+# different shards never contend.
+_SHARD_BITS = 4
+_SHARD_COUNT = 1 << _SHARD_BITS
+_shards: List[Tuple[SubscriberChannel, ...]] = [() for _ in range(_SHARD_COUNT)]
+_shard_locks = [threading.Lock() for _ in range(_SHARD_COUNT)]
+
+
+def _shard_of(q: SubscriberChannel) -> int:
+    # Object addresses are aligned and allocated in strides, so mix them (Fibonacci hashing) and
+    # take the top bits of the 64-bit product.
+    return (((id(q) >> 4) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> (64 - _SHARD_BITS)
+
+
+def subscribe() -> SubscriberChannel:
+    q = SubscriberChannel()
+    i = _shard_of(q)
+    with _shard_locks[i]:
+        _shards[i] = (*_shards[i], q)
     return q
 
 
-def unsubscribe(q: "queue.Queue[Event]") -> None:
-    with _lock:
-        if q in _subscribers:
-            _subscribers.remove(q)
+def unsubscribe(q: SubscriberChannel) -> None:
+    i = _shard_of(q)
+    with _shard_locks[i]:
+        _shards[i] = tuple(s for s in _shards[i] if s is not q)
 
 
 def emit(event_type: str, data: Dict[str, Any]) -> None:
-    ev = Event(type=event_type, data=data, ts=time.time())
-    with _lock:
-        subs = list(_subscribers)
-    for q in subs:
+    ev: Optional[Event] = None
+    for shard in _shards:
+        for q in shard:
+            if ev is None:
+                # Serialize once per event (and only if someone is listening), not once per subscriber.
+                ts = time.time()
+                ev = Event(type=event_type, data=data, ts=ts, frame=_encode_frame(event_type, data, ts))
+            try:
+                q.put_nowait(ev)
+            except Exception:
+                pass
+
+
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
         try:
-            q.put_nowait(ev)
-        except Exception:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
             pass
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+@functools.lru_cache(maxsize=64)
+def _frame_prefix(event_type: str) -> bytes:
+    # Event types are a small fixed set; JSON-escape each once and reuse the envelope head.
+    return b"event: " + event_type.encode("utf-8") + b'\ndata: {"type":' + _dumps(event_type) + b',"data":'
+
+
+def _encode_frame(event_type: str, data: Dict[str, Any], ts: float) -> bytes:
+    # Only `data` is variable; the envelope around it is assembled from bytes.
+    return _frame_prefix(event_type) + _dumps(data) + b',"ts":' + repr(ts).encode("ascii") + b"}\n\n"
 
 
-def format_sse(ev: Event) -> str:
-    payload = json.dumps({"type": ev.type, "data": ev.data, "ts": ev.ts}, ensure_ascii=False)
-    return f"event: {ev.type}\ndata: {payload}\n\n"
+def format_sse(ev: Event) -> bytes:
+    return ev.frame if ev.frame is not None else _encode_frame(ev.type, ev.data, ev.ts)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import re
+import functools
 from typing import Dict, Mapping, Optional
 
 from fastapi import Request
@@ -257,6 +257,7 @@ _TRANSLATIONS["en"].setdefault("citations.warn_reasons_prefix", "Citation check:
 _TRANSLATIONS["zh"].setdefault("citations.warn_reasons_prefix", "引用校验：")
 
 
+@functools.lru_cache(maxsize=64)
 def normalize_lang(raw: Optional[str]) -> str:
     if not raw:
         return DEFAULT_LANG
@@ -277,19 +278,46 @@ def detect_lang(request: Request) -> str:
     c = request.cookies.get("lang")
     if c:
         return normalize_lang(c)
-    accept = request.headers.get("accept-language", "")
-    m = re.match(r"\s*([a-zA-Z-]+)", accept)
-    return normalize_lang(m.group(1) if m else None)
+    # Only the primary tag's first two letters matter (same outcome as normalize_lang on it).
+    prefix = request.headers.get("accept-language", "").lstrip()[:2].lower()
+    if prefix == "zh":
+        return "zh"
+    if prefix == "en":
+        return "en"
+    return DEFAULT_LANG
 
 
-def t(lang: str, key: str, **kwargs: object) -> str:
-    table: Mapping[str, str] = _TRANSLATIONS.get(lang, _TRANSLATIONS[DEFAULT_LANG])
-    s = table.get(key) or _TRANSLATIONS[DEFAULT_LANG].get(key) or key
+# (lang, key) -> text, built once the tables above are final.
+_FLAT: Dict[tuple[str, str], str] = {
+    (lang, key): val for lang, table in _TRANSLATIONS.items() for key, val in table.items() if val
+}
+_FALLBACK: Mapping[str, str] = _TRANSLATIONS[DEFAULT_LANG]
+
+
+def _render(s: str, kwargs: Mapping[str, object]) -> str:
     try:
-        return s.format(**kwargs)
+        return s.format_map(kwargs)
     except Exception:
         return s
 
 
+@functools.lru_cache(maxsize=4096, typed=True)
+def _t_cached(lang: str, key: str, kwargs_items: tuple[tuple[str, type, object], ...]) -> str:
+    # Each value travels with its type: 1, 1.0 and True hash and compare equal but format differently,
+    # and typed=True only distinguishes top-level arguments.
+    s = _FLAT.get((lang, key)) or _FALLBACK.get(key) or key
+    return _render(s, {k: v for k, _tp, v in kwargs_items})
+
+
+def t(lang: str, key: str, **kwargs: object) -> str:
+    if not kwargs:
+        return _FLAT.get((lang, key)) or _FALLBACK.get(key) or key
+    try:
+        return _t_cached(lang, key, tuple((k, type(v), v) for k, v in sorted(kwargs.items())))
+    except TypeError:
+        # Unhashable argument values cannot be cached; render directly.
+        return _render(_FLAT.get((lang, key)) or _FALLBACK.get(key) or key, kwargs)
+
+
 def with_lang(request: Request, lang: str) -> str:
     return str(request.url.include_query_params(lang=normalize_lang(lang)))
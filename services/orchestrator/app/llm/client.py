@@ -1,31 +1,65 @@
 from __future__ import annotations
 
 import base64
+import functools
 import json
 import mimetypes
 import os
+from collections import defaultdict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from typing import Any, DefaultDict, Dict, Iterable, List, Optional, Tuple, Union
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from ..config import settings
 
+try:
+    import orjson
+except Exception:  # optional speedup; stdlib json is the fallback
+    orjson = None  # type: ignore[assignment]
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 
 class LLMError(RuntimeError):
     pass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LLMResponse:
     raw: Dict[str, Any]
     content: str
     tool_calls: List[Dict[str, Any]]
 
 
-def _headers(api_key: Optional[str] = None) -> Dict[str, str]:
-    key = api_key or os.getenv("OPENAI_API_KEY") or settings.llm_api_key
+@functools.cache
+def _session() -> requests.Session:
+    # One keep-alive pool shared by every run thread: repeat calls to the gateway skip the TCP/TLS handshake.
+    sess = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32)
+    sess.mount("http://", adapter)
+    sess.mount("https://", adapter)
+    return sess
+
+
+@functools.lru_cache(maxsize=1)
+def _config() -> Tuple[str, Dict[str, str]]:
+    """
+    (base_url, default headers) from the environment, read once.
+    The dict is shared; requests copies headers per call and nothing here mutates it.
+    """
+    base = (os.getenv("OPENAI_BASE_URL") or settings.llm_base_url).rstrip("/")
+    return base, _build_headers(os.getenv("OPENAI_API_KEY") or settings.llm_api_key)
+
+
+def reset_llm_config() -> None:
+    """Drop the cached gateway settings; call after changing OPENAI_BASE_URL / OPENAI_API_KEY at runtime."""
+    _config.cache_clear()
+
+
+def _build_headers(key: str) -> Dict[str, str]:
     # OpenAI-compatible expects Authorization Bearer
     return {
         "Authorization": f"Bearer {key}",
@@ -33,10 +67,14 @@ def _headers(api_key: Optional[str] = None) -> Dict[str, str]:
     }
 
 
+def _headers(api_key: Optional[str] = None) -> Dict[str, str]:
+    if api_key:
+        return _build_headers(api_key)
+    return _config()[1]
+
+
 def _url(path: str) -> str:
-    base = (os.getenv("OPENAI_BASE_URL") or settings.llm_base_url).rstrip("/")
-    path = path.lstrip("/")
-    return f"{base}/{path}"
+    return f"{_config()[0]}/{path.lstrip('/')}"
 
 
 def _is_gpt_family_model(model: str) -> bool:
@@ -44,23 +82,29 @@ def _is_gpt_family_model(model: str) -> bool:
     return "gpt" in m
 
 
-def _iter_sse_data_lines(resp: requests.Response) -> Iterable[str]:
+_SSE_DATA = b"data:"
+_SSE_DATA_LEN = len(_SSE_DATA)
+
+
+def _iter_sse_data_lines(resp: requests.Response) -> Iterable[bytes]:
     """
-    Iterate Server-Sent Events response lines, yielding decoded `data:` payloads.
+    Iterate Server-Sent Events response lines, yielding raw `data:` payloads.
 
     OpenAI-compatible streaming uses:
       data: {...json...}
       data: [DONE]
+
+    Lines stay as bytes: the JSON parser accepts them directly, so no per-chunk decode is needed.
     """
-    for raw in resp.iter_lines(decode_unicode=True):
-        if raw is None:
-            continue
-        line = str(raw).strip()
-        if not line:
-            continue
-        if not line.startswith("data:"):
-            continue
-        yield line[len("data:") :].strip()
+    # iter_lines already splits on line endings; only the payload needs trimming.
+    for line in resp.iter_lines(decode_unicode=False):
+        if line and line.startswith(_SSE_DATA):
+            yield line[_SSE_DATA_LEN:].strip()
+
+
+def _new_stream_tool_call() -> Dict[str, Any]:
+    # Argument fragments are collected in _arg_parts and joined once at the end (avoids quadratic str +=).
+    return {"id": "", "type": "function", "function": {"name": "", "arguments": ""}, "_arg_parts": []}
 
 
 def _chat_streaming(
@@ -72,58 +116,61 @@ def _chat_streaming(
     payload = dict(payload)
     payload["stream"] = True
 
-    r = requests.post(
+    r = _session().post(
         _url("/chat/completions"),
         headers=_headers(),
         json=payload,
         timeout=timeout_s,
         stream=True,
     )
-    if r.status_code >= 400:
-        raise LLMError(f"chat/completions failed: {r.status_code} {r.text[:800]}")
-
-    content_parts: List[str] = []
-    tool_calls_by_index: Dict[int, Dict[str, Any]] = {}
-    last_chunk: Dict[str, Any] = {}
-
-    for data_line in _iter_sse_data_lines(r):
-        if data_line == "[DONE]":
-            break
-        try:
-            chunk = json.loads(data_line)
-        except Exception:
-            continue
-        if not isinstance(chunk, dict):
-            continue
-        last_chunk = chunk
-        choices = chunk.get("choices") or []
-        if not choices:
-            continue
-        delta = (choices[0] or {}).get("delta") or {}
-        if isinstance(delta, dict):
-            if delta.get("content"):
-                content_parts.append(str(delta.get("content")))
-            if delta.get("tool_calls"):
-                for tc in delta.get("tool_calls") or []:
-                    try:
-                        idx = int(tc.get("index") if tc.get("index") is not None else 0)
-                    except Exception:
-                        idx = 0
-                    cur = tool_calls_by_index.get(idx)
-                    if cur is None:
-                        cur = {"id": "", "type": "function", "function": {"name": "", "arguments": ""}}
-                        tool_calls_by_index[idx] = cur
-                    if tc.get("id"):
-                        cur["id"] = tc.get("id")
-                    if tc.get("type"):
-                        cur["type"] = tc.get("type")
-                    fn = tc.get("function") or {}
-                    if isinstance(fn, dict):
-                        if fn.get("name"):
-                            cur["function"]["name"] = fn.get("name")
-                        if fn.get("arguments"):
-                            cur["function"]["arguments"] += str(fn.get("arguments"))
-
+    # Streamed responses only return their connection to the shared pool once closed.
+    try:
+        if r.status_code >= 400:
+            raise LLMError(f"chat/completions failed: {r.status_code} {r.text[:800]}")
+
+        content_parts: List[str] = []
+        tool_calls_by_index: DefaultDict[int, Dict[str, Any]] = defaultdict(_new_stream_tool_call)
+        last_chunk: Dict[str, Any] = {}
+
+        for data_line in _iter_sse_data_lines(r):
+            if data_line == b"[DONE]":
+                break
+            try:
+                chunk = _json_loads(data_line)
+            except Exception:
+                continue
+            if not isinstance(chunk, dict):
+                continue
+            last_chunk = chunk
+            choices = chunk.get("choices") or []
+            if not choices:
+                continue
+            delta = (choices[0] or {}).get("delta") or {}
+            if isinstance(delta, dict):
+                if delta.get("content"):
+                    content_parts.append(str(delta.get("content")))
+                if delta.get("tool_calls"):
+                    for tc in delta.get("tool_calls") or []:
+                        try:
+                            idx = int(tc.get("index") if tc.get("index") is not None else 0)
+                        except Exception:
+                            idx = 0
+                        cur = tool_calls_by_index[idx]
+                        if tc.get("id"):
+                            cur["id"] = tc.get("id")
+                        if tc.get("type"):
+                            cur["type"] = tc.get("type")
+                        fn = tc.get("function") or {}
+                        if isinstance(fn, dict):
+                            if fn.get("name"):
+                                cur["function"]["name"] = fn.get("name")
+                            if fn.get("arguments"):
+                                cur["_arg_parts"].append(str(fn.get("arguments")))
+    finally:
+        r.close()
+
+    for cur in tool_calls_by_index.values():
+        cur["function"]["arguments"] = "".join(cur.pop("_arg_parts"))
     tool_calls = [tool_calls_by_index[i] for i in sorted(tool_calls_by_index.keys())]
     content = "".join(content_parts)
 
@@ -172,7 +219,7 @@ def chat(
     if must_stream:
         return _chat_streaming(model=model, payload=payload, timeout_s=timeout_s)
 
-    r = requests.post(_url("/chat/completions"), headers=_headers(), json=payload, timeout=timeout_s)
+    r = _session().post(_url("/chat/completions"), headers=_headers(), json=payload, timeout=timeout_s)
     if r.status_code >= 400:
         raise LLMError(f"chat/completions failed: {r.status_code} {r.text[:800]}")
     data = r.json()
@@ -185,7 +232,7 @@ def chat(
 
 def embeddings(*, model: str, inputs: List[str]) -> List[List[float]]:
     payload = {"model": model, "input": inputs}
-    r = requests.post(_url("/embeddings"), headers=_headers(), json=payload, timeout=120)
+    r = _session().post(_url("/embeddings"), headers=_headers(), json=payload, timeout=120)
     if r.status_code >= 400:
         raise LLMError(f"embeddings failed: {r.status_code} {r.text[:800]}")
     data = r.json()
@@ -206,12 +253,84 @@ def images_generate(*, model: str, prompt: str, size: str = "1024x1024", n: int
         # request b64 to avoid relying on external URL storage
         "response_format": "b64_json",
     }
-    r = requests.post(_url("/images/generations"), headers=_headers(), json=payload, timeout=600)
+    r = _session().post(_url("/images/generations"), headers=_headers(), json=payload, timeout=600)
     if r.status_code >= 400:
         raise LLMError(f"images/generations failed: {r.status_code} {r.text[:800]}")
     return r.json()
 
 
+class _MultipartFileBody:
+    """
+    multipart/form-data body that streams file parts from disk.
+
+    requests sends an iterable with read() and len() as a fixed-length body in blocks, so an upload is
+    never materialized in memory (requests' own `files=` encoder reads every file fully first).
+    """
+
+    _CHUNK = 1024 * 1024
+
+    def __init__(self, fields: Dict[str, str], files: Dict[str, Path]) -> None:
+        boundary = os.urandom(16).hex()
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        parts: List[Union[bytes, Path]] = []
+        for name, value in fields.items():
+            parts.append(
+                f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode("utf-8")
+            )
+        for name, path in files.items():
+            mime = mimetypes.guess_type(str(path))[0] or "application/octet-stream"
+            filename = path.name.replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+            parts.append(
+                (
+                    f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                    f"Content-Type: {mime}\r\n\r\n"
+                ).encode("utf-8")
+            )
+            parts.append(path)
+            parts.append(b"\r\n")
+        parts.append(f"--{boundary}--\r\n".encode("ascii"))
+        self._parts = parts
+        self._len = sum(p.stat().st_size if isinstance(p, Path) else len(p) for p in parts)
+        self._gen: Optional[Iterable[bytes]] = None
+        self._buf = b""
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self):
+        for part in self._parts:
+            if isinstance(part, Path):
+                with part.open("rb") as f:
+                    while True:
+                        chunk = f.read(self._CHUNK)
+                        if not chunk:
+                            break
+                        yield chunk
+            else:
+                yield part
+
+    def read(self, amt: Optional[int] = -1) -> bytes:
+        if self._gen is None:
+            self._gen = iter(self)
+        if amt is None or amt < 0:
+            out = self._buf + b"".join(self._gen)
+            self._buf = b""
+            return out
+        while len(self._buf) < amt:
+            chunk = next(self._gen, None)  # type: ignore[call-overload]
+            if chunk is None:
+                break
+            self._buf += chunk
+        out, self._buf = self._buf[:amt], self._buf[amt:]
+        return out
+
+
+def _post_multipart(url: str, fields: Dict[str, str], files: Dict[str, Path], timeout: float) -> requests.Response:
+    body = _MultipartFileBody(fields, files)
+    headers = {"Authorization": _headers()["Authorization"], "Content-Type": body.content_type}
+    return _session().post(url, headers=headers, data=body, timeout=timeout)
+
+
 def images_edit(
     *,
     model: str,
@@ -222,13 +341,9 @@ def images_edit(
     n: int = 1,
 ) -> Dict[str, Any]:
     # OpenAI-compatible image edits use multipart/form-data
-    url = _url("/images/edits")
-    headers = {"Authorization": _headers()["Authorization"]}
-    files = {
-        "image": (image_path.name, image_path.read_bytes(), mimetypes.guess_type(str(image_path))[0] or "application/octet-stream"),
-    }
+    files = {"image": image_path}
     if mask_path is not None:
-        files["mask"] = (mask_path.name, mask_path.read_bytes(), mimetypes.guess_type(str(mask_path))[0] or "application/octet-stream")
+        files["mask"] = mask_path
     data = {
         "model": model,
         "prompt": prompt,
@@ -236,22 +351,17 @@ def images_edit(
         "n": str(n),
         "response_format": "b64_json",
     }
-    r = requests.post(url, headers=headers, files=files, data=data, timeout=600)
+    r = _post_multipart(_url("/images/edits"), data, files, timeout=600)
     if r.status_code >= 400:
         raise LLMError(f"images/edits failed: {r.status_code} {r.text[:800]}")
     return r.json()
 
 
 def audio_transcribe(*, model: str, audio_path: Path, language: Optional[str] = None) -> Dict[str, Any]:
-    url = _url("/audio/transcriptions")
-    headers = {"Authorization": _headers()["Authorization"]}
-    files = {
-        "file": (audio_path.name, audio_path.read_bytes(), mimetypes.guess_type(str(audio_path))[0] or "application/octet-stream"),
-    }
     data = {"model": model}
     if language:
         data["language"] = language
-    r = requests.post(url, headers=headers, files=files, data=data, timeout=600)
+    r = _post_multipart(_url("/audio/transcriptions"), data, {"file": audio_path}, timeout=600)
     if r.status_code >= 400:
         raise LLMError(f"audio/transcriptions failed: {r.status_code} {r.text[:800]}")
     return r.json()
@@ -260,7 +370,7 @@ def audio_transcribe(*, model: str, audio_path: Path, language: Optional[str] =
 def audio_speech(*, model: str, text: str, voice: str = "alloy", format: str = "mp3") -> bytes:
     # OpenAI-compatible TTS endpoint
     payload = {"model": model, "input": text, "voice": voice, "format": format}
-    r = requests.post(_url("/audio/speech"), headers=_headers(), json=payload, timeout=600)
+    r = _session().post(_url("/audio/speech"), headers=_headers(), json=payload, timeout=600)
     if r.status_code >= 400:
         raise LLMError(f"audio/speech failed: {r.status_code} {r.text[:800]}")
     return r.content
@@ -280,7 +390,7 @@ def videos_generate(*, model: str, prompt: str, size: Optional[str] = None, dura
     if duration_seconds is not None:
         payload["duration_seconds"] = duration_seconds
         payload.setdefault("seconds", duration_seconds)
-    r = requests.post(_url("/videos"), headers=_headers(), json=payload, timeout=600)
+    r = _session().post(_url("/videos"), headers=_headers(), json=payload, timeout=600)
     if r.status_code >= 400:
         raise LLMError(f"videos failed: {r.status_code} {r.text[:800]}")
     return r.json()
@@ -288,7 +398,7 @@ def videos_generate(*, model: str, prompt: str, size: Optional[str] = None, dura
 
 def videos_status(*, video_id: str) -> Dict[str, Any]:
     """OpenAI-compatible video status: GET /videos/{video_id}."""
-    r = requests.get(_url(f"/videos/{video_id}"), headers=_headers(), timeout=120)
+    r = _session().get(_url(f"/videos/{video_id}"), headers=_headers(), timeout=120)
     if r.status_code >= 400:
         raise LLMError(f"videos status failed: {r.status_code} {r.text[:800]}")
     return r.json()
@@ -296,21 +406,42 @@ def videos_status(*, video_id: str) -> Dict[str, Any]:
 
 def videos_retrieve(*, video_id: str) -> bytes:
     """OpenAI-compatible video content download: GET /videos/{video_id}/content."""
-    r = requests.get(_url(f"/videos/{video_id}/content"), headers=_headers(), timeout=600)
+    r = _session().get(_url(f"/videos/{video_id}/content"), headers=_headers(), timeout=600)
     if r.status_code >= 400:
         raise LLMError(f"videos content failed: {r.status_code} {r.text[:800]}")
     return r.content
 
 
+def _b64_file(path: Path) -> str:
+    """
+    Base64-encode a file into a preallocated buffer, reading it in chunks (the raw file is never held whole).
+    """
+    size = path.stat().st_size
+    out = bytearray(4 * ((size + 2) // 3))
+    chunk_size = 3 * 256 * 1024  # multiple of 3: no padding until the final chunk
+    pos = 0
+    with path.open("rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            enc = base64.b64encode(chunk)
+            out[pos : pos + len(enc)] = enc
+            pos += len(enc)
+    # The file may have changed size since stat(); trim or extend to what was actually encoded.
+    del out[pos:]
+    return out.decode("ascii")
+
+
 def videos_remix(*, model: str, prompt: str, video_id: str, reference_image_path: Optional[Path] = None) -> Dict[str, Any]:
     """OpenAI-compatible video remix: POST /videos/{video_id}/remix."""
     payload: Dict[str, Any] = {"model": model, "prompt": prompt}
     # Some providers may support a reference image; we send as base64 if provided
     if reference_image_path:
-        b64 = base64.b64encode(reference_image_path.read_bytes()).decode("utf-8")
+        b64 = _b64_file(reference_image_path)
         payload["reference_image_b64"] = b64
         payload["reference_image_filename"] = reference_image_path.name
-    r = requests.post(_url(f"/videos/{video_id}/remix"), headers=_headers(), json=payload, timeout=600)
+    r = _session().post(_url(f"/videos/{video_id}/remix"), headers=_headers(), json=payload, timeout=600)
     if r.status_code >= 400:
         raise LLMError(f"videos remix failed: {r.status_code} {r.text[:800]}")
     return r.json()
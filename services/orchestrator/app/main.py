@@ -1,30 +1,50 @@
 from __future__ import annotations
 
-import asyncio
+import atexit
 import base64
+import codecs
+import functools
+import hashlib
 import io
 import json
 import logging
 import os
+import queue
 import re
 import shutil
+import stat
 import subprocess
+import threading
 import zipfile
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import mimetypes
-from logging.handlers import RotatingFileHandler
-from typing import Any, Dict, List, Optional
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from fastapi import BackgroundTasks, FastAPI, File, Form, HTTPException, Request, UploadFile
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, Response, StreamingResponse, FileResponse
+from fastapi.responses import (
+    FileResponse,
+    HTMLResponse,
+    JSONResponse,
+    ORJSONResponse,
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, select_autoescape
+
+try:
+    import orjson
+except Exception:  # optional speedup; stdlib json is the fallback
+    orjson = None  # type: ignore[assignment]
 
 from .config import settings
 from .events import subscribe, unsubscribe, format_sse
-from .db import init_db, exec_sql, from_json, q_all, q_one, to_json
+from .db import close_db, init_db, exec_many, exec_sql, from_json, q_all, q_all_cached, q_one, to_json, write_seq
 from .schemas import (
     ApprovalDecision,
     KBIngestRequest,
@@ -47,7 +67,7 @@ from .runner.engine import (
     create_workspace,
     start_task_background,
 )
-from .scheduler.scheduler import start_scheduler
+from .scheduler.scheduler import start_scheduler, stop_scheduler
 from .tools.base import list_tools
 from .tools.rag import kb_ingest, kb_query
 from .i18n import detect_lang, normalize_lang, t as tr, with_lang, SUPPORTED_LANGS
@@ -141,15 +161,21 @@ def _configure_logging_once() -> None:
     try:
         handler = RotatingFileHandler(str(log_path), maxBytes=2_000_000, backupCount=5, encoding="utf-8")
         handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        # Request threads only enqueue records; a listener thread owns the file writes and rotation.
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        qh = QueueHandler(log_queue)
         root = logging.getLogger()
         root.setLevel(logging.INFO)
-        root.addHandler(handler)
+        root.addHandler(qh)
         # Ensure Uvicorn logs also land in the file (in addition to the desktop_shell stdout/stderr logs).
         for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
             try:
                 lg = logging.getLogger(name)
                 lg.setLevel(logging.INFO)
-                lg.addHandler(handler)
+                lg.addHandler(qh)
             except Exception:
                 continue
         logging.getLogger("owb").info("logging_initialized build_id=%s build_time=%s", APP_BUILD_ID, APP_BUILD_TIME)
@@ -163,15 +189,60 @@ def _configure_logging_once() -> None:
     except Exception:
         pass
 
+def _jinja_bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+    # Compiled templates persist across restarts; entries are checksummed against the source, so edits still apply.
+    try:
+        cache_dir = settings.data_dir / ".jinja_cache"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        return FileSystemBytecodeCache(str(cache_dir))
+    except Exception:
+        return None
+
+
+# Templates ship with the app; only re-stat them on every render when OWB_DEV=1.
 jinja = Environment(
     loader=FileSystemLoader(str(TEMPLATES_DIR)),
     autoescape=select_autoescape(["html", "xml"]),
+    auto_reload=str(os.getenv("OWB_DEV") or "").strip() == "1",
+    bytecode_cache=_jinja_bytecode_cache(),
 )
 
+def _tojson_filter(v: Any, indent: int = 2) -> str:
+    # orjson only pretty-prints with a 2-space indent; any other indent goes through stdlib json.
+    if orjson is not None and indent == 2:
+        try:
+            return orjson.dumps(v, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(v, ensure_ascii=False, indent=indent)
+
+
 # Jinja helper: JSON pretty-print
-jinja.filters["tojson"] = lambda v, indent=2: json.dumps(v, ensure_ascii=False, indent=indent)
+jinja.filters["tojson"] = _tojson_filter
 
-app = FastAPI(title=settings.app_name)
+
+def _precompile_templates() -> Dict[str, Template]:
+    # Compile every page template once at import (after filters are registered) so render() is a dict lookup.
+    out: Dict[str, Template] = {}
+    try:
+        names = jinja.list_templates(extensions=["html"])
+    except Exception:
+        return out
+    for name in names:
+        try:
+            out[name] = jinja.get_template(name)
+        except Exception:
+            continue
+    return out
+
+
+# With auto_reload (OWB_DEV=1) templates must keep going through the loader so edits show up.
+_TPL: Dict[str, Template] = {} if jinja.auto_reload else _precompile_templates()
+
+# orjson-backed JSON for every API route when available (ORJSONResponse requires the package).
+_API_JSON = ORJSONResponse if orjson is not None else JSONResponse
+
+app = FastAPI(title=settings.app_name, default_response_class=_API_JSON)
 _patch_subprocess_no_window_once()
 _configure_logging_once()
 
@@ -180,6 +251,70 @@ def _uak_db_path() -> Path:
     return (settings.data_dir / "uak.db").resolve()
 
 
+# Per-thread read-only connections to uak.db, kept open across requests so SQLite's page cache stays warm.
+_UAK_CONN_TLS = threading.local()
+_UAK_CONNS: List["sqlite3.Connection"] = []
+_UAK_CONNS_LOCK = threading.Lock()
+
+
+def _uak_conn() -> "sqlite3.Connection":
+    path = _uak_db_path()
+    # (st_dev, st_ino) identifies the file itself: if uak.db was replaced (new inode), a cached connection
+    # would keep reading the old, unlinked file without ever erroring, so reopen. Ordinary writes keep the inode.
+    st = os.stat(path)
+    ident = (st.st_dev, st.st_ino)
+    con = getattr(_UAK_CONN_TLS, "c", None)
+    if con is not None:
+        if getattr(_UAK_CONN_TLS, "ident", None) == ident:
+            return con
+        _drop_uak_conn()
+    import sqlite3
+
+    # Read-only: uak.db belongs to the UAK runtime (which also owns its journal mode); we only query it.
+    con = sqlite3.connect(path.as_uri() + "?mode=ro", uri=True, check_same_thread=False, isolation_level=None)
+    con.executescript(
+        """
+        PRAGMA mmap_size=268435456;
+        PRAGMA cache_size=-65536;
+        PRAGMA busy_timeout=5000;
+        """
+    )
+    _UAK_CONN_TLS.c = con
+    _UAK_CONN_TLS.ident = ident
+    with _UAK_CONNS_LOCK:
+        _UAK_CONNS.append(con)
+    return con
+
+
+def _drop_uak_conn() -> None:
+    # Forget this thread's connection (after a query error, or once _uak_conn() sees uak.db was replaced).
+    con = getattr(_UAK_CONN_TLS, "c", None)
+    _UAK_CONN_TLS.c = None
+    if con is None:
+        return
+    with _UAK_CONNS_LOCK:
+        try:
+            _UAK_CONNS.remove(con)
+        except ValueError:
+            pass
+    try:
+        con.close()
+    except Exception:
+        pass
+
+
+@atexit.register
+def _close_uak_conns() -> None:
+    with _UAK_CONNS_LOCK:
+        conns = list(_UAK_CONNS)
+        _UAK_CONNS.clear()
+    for con in conns:
+        try:
+            con.close()
+        except Exception:
+            pass
+
+
 def _b64url_encode(raw: str) -> str:
     b = str(raw or "").encode("utf-8")
     return base64.urlsafe_b64encode(b).decode("ascii").rstrip("=")
@@ -193,10 +328,13 @@ def _b64url_decode(raw: str) -> str:
     return base64.urlsafe_b64decode((s + pad).encode("ascii")).decode("utf-8", errors="strict")
 
 
+# File ids are pure functions of their inputs and the same ones recur across listings and renders.
+@functools.lru_cache(maxsize=8192)
 def _encode_task_file_id(*, root: str, rel: str) -> str:
     return _b64url_encode(f"{root}:{rel}")
 
 
+@functools.lru_cache(maxsize=8192)
 def _decode_task_file_id(file_id: str) -> tuple[str, str]:
     raw = _b64url_decode(file_id)
     if ":" not in raw:
@@ -211,21 +349,27 @@ def _safe_rel(rel: str) -> str:
     s = str(rel or "").replace("\\", "/").strip().lstrip("/")
     if not s:
         raise ValueError("empty path")
-    parts = [p for p in s.split("/") if p and p not in (".",)]
-    if any(p == ".." for p in parts):
+    parts = [p for p in s.split("/") if p and p != "."]
+    if ".." in parts:
         raise ValueError("path traversal")
-    if any(":" in p for p in parts):
+    # A ':' can only sit inside a kept segment, so one scan of the whole string covers every part.
+    if ":" in s:
         raise ValueError("invalid path")
     return "/".join(parts)
 
 
+@functools.lru_cache(maxsize=256)
+def _workspace_outputs_base(ws_id: str) -> Path:
+    # Workspace paths are fixed once created; call _workspace_outputs_base.cache_clear() if that changes.
+    ws = q_one("SELECT path FROM workspaces WHERE id=?", (ws_id,))
+    return Path(str((ws or {}).get("path") or settings.workspaces_dir)).resolve() / "outputs"
+
+
 def _task_outputs_root(*, task: dict[str, Any]) -> Path:
     ws_id = str(task.get("workspace_id") or "").strip()
     if not ws_id:
         return (settings.workspaces_dir / "default" / "outputs" / str(task.get("id") or "")).resolve()
-    ws = q_one("SELECT * FROM workspaces WHERE id=?", (ws_id,))
-    ws_root = Path(str((ws or {}).get("path") or settings.workspaces_dir)).resolve()
-    return (ws_root / "outputs" / str(task.get("id") or "")).resolve()
+    return (_workspace_outputs_base(ws_id) / str(task.get("id") or "")).resolve()
 
 
 def _resolve_task_file_path(*, task: dict[str, Any], file_id: str) -> Path:
@@ -250,42 +394,99 @@ def _resolve_task_file_path(*, task: dict[str, Any], file_id: str) -> Path:
     return p
 
 
-def _guess_kind(path: Path) -> str:
-    ext = str(path.suffix or "").lower().lstrip(".")
-    if ext:
-        return ext
-    return "file"
+@functools.lru_cache(maxsize=32)
+def _read_report_preview(path: str, mtime_ns: int, size: int) -> str:
+    # mtime_ns/size are part of the cache key only: a rewritten report gets a fresh entry.
+    # Read at most one byte past the limit: enough to know whether to truncate, without loading huge reports.
+    with open(path, "rb") as f:
+        b = f.read(240_001)
+    if len(b) > 240_000:
+        b = b[:240_000] + b"\n\n--- TRUNCATED ---\n"
+    return b.decode("utf-8", errors="ignore")
+
+
+def _report_preview(report_path: str) -> str:
+    # One stat per request; the read and decode are shared until the file changes.
+    try:
+        st = os.stat(report_path)
+        if not stat.S_ISREG(st.st_mode):
+            return ""
+        return _read_report_preview(report_path, st.st_mtime_ns, st.st_size)
+    except Exception:
+        return ""
+
+
+def _walk_files(root: Path, *, skip_suffix: str = "") -> Iterator[Tuple[os.DirEntry, str, os.stat_result]]:
+    # Recursive file walk over os.scandir: DirEntry type checks reuse readdir's d_type (and Windows' cached
+    # stat), unlike rglob + is_file + stat per path. Yields (entry, posix path relative to root, stat).
+    # Directory symlinks are not descended into; unreadable directories and entries are skipped, as are
+    # files whose name ends in `skip_suffix` (checked before they are stat'ed).
+    root_s = str(root)
+    cut = len(root_s) + (0 if root_s.endswith(os.sep) else 1)
+    stack = [root_s]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    if not entry.is_file() or (skip_suffix and entry.name.endswith(skip_suffix)):
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                rel = entry.path[cut:]
+                if os.sep != "/":
+                    rel = rel.replace(os.sep, "/")
+                yield entry, rel, st
+
+
+def _guess_kind(name: str) -> str:
+    # The extension is "" or "." + ext; slicing off the dot covers both without extra passes.
+    return os.path.splitext(name)[1][1:].lower() or "file"
+
+
+# Preview preference by file kind (lower wins); unknown kinds rank last.
+_KIND_PRIO: Dict[str, int] = {
+    "pptx": 0,
+    "pdf": 1,
+    "html": 2,
+    "htm": 2,
+    "md": 3,
+    "markdown": 3,
+    "png": 4,
+    "jpg": 4,
+    "jpeg": 4,
+    "gif": 4,
+    "webp": 4,
+    "bmp": 4,
+    "svg": 4,
+    "docx": 5,
+}
 
 
 def _pick_default_file_id(files: list[dict[str, Any]]) -> str:
     if not files:
         return ""
-
-    def _prio(f: dict[str, Any]) -> int:
-        kind = str(f.get("kind") or "").lower()
-        if kind == "pptx":
-            return 0
-        if kind == "pdf":
-            return 1
-        if kind in ("html", "htm"):
-            return 2
-        if kind in ("md", "markdown"):
-            return 3
-        if kind in ("png", "jpg", "jpeg", "gif", "webp", "bmp", "svg"):
-            return 4
-        if kind == "docx":
-            return 5
-        return 50
-
-    sorted_files = sorted(
+    # Only the best file is needed, so a single min() pass replaces the full sort
+    # (min keeps the first of equal keys, matching the old stable sort).
+    best = min(
         files,
         key=lambda f: (
-            _prio(f),
+            _KIND_PRIO.get(str(f.get("kind") or "").lower(), 50),
             -float(f.get("mtime") or 0.0),
             str(f.get("name") or ""),
         ),
     )
-    return str(sorted_files[0].get("id") or "")
+    return str(best.get("id") or "")
+
+
+_RE_URL = re.compile(r"\bhttps?://\S+")
 
 
 def _load_uak_citation_index(*, run_id: str, max_chunks: int = 800) -> Dict[str, Any]:
@@ -303,17 +504,15 @@ def _load_uak_citation_index(*, run_id: str, max_chunks: int = 800) -> Dict[str,
     if not db_path.exists():
         return {"chunks": {}, "warnings": []}
 
-    import sqlite3
-
     try:
-        con = sqlite3.connect(str(db_path))
+        con = _uak_conn()
     except Exception:
         return {"chunks": {}, "warnings": []}
 
     def _safe_json(s: Any) -> Any:
         try:
             if isinstance(s, str) and s:
-                return json.loads(s)
+                return from_json(s)
         except Exception:
             return None
         return None
@@ -323,18 +522,22 @@ def _load_uak_citation_index(*, run_id: str, max_chunks: int = 800) -> Dict[str,
             v = meta.get(k)
             if isinstance(v, str) and v.strip():
                 return v.strip()
-        m = re.search(r"\\bhttps?://\\S+", text or "")
+        m = _RE_URL.search(text or "")
         if m:
             return str(m.group(0)).rstrip(").,;:!?]}\"'")
         return ""
 
+    limit = int(max_chunks)
     try:
         cur = con.cursor()
+        cur.arraysize = 64
         cur.execute(
             "SELECT tool_name, response_json FROM tool_recordings WHERE run_id=? AND status='DONE' ORDER BY id ASC",
             (rid,),
         )
-        for tool_name, response_json in cur.fetchall() or []:
+        # Stream rows off the cursor; stop reading as soon as the chunk budget is spent.
+        full = False
+        for tool_name, response_json in cur:
             resp = _safe_json(response_json) or {}
             if not isinstance(resp, dict):
                 continue
@@ -365,12 +568,20 @@ def _load_uak_citation_index(*, run_id: str, max_chunks: int = 800) -> Dict[str,
                     "kind": str(meta.get("kind") or ""),
                     "snippet": snippet,
                 }
-                if len(chunks) >= int(max_chunks):
+                if len(chunks) >= limit:
+                    full = True
                     break
-            if len(chunks) >= int(max_chunks):
+            if full:
+                cur.close()
                 break
     except Exception:
         chunks = {}
+        # Reopen for the warnings query below; a failed chunk scan must not hide guardrail warnings.
+        _drop_uak_conn()
+        try:
+            con = _uak_conn()
+        except Exception:
+            return {"chunks": chunks, "warnings": warnings}
 
     try:
         cur = con.cursor()
@@ -378,7 +589,7 @@ def _load_uak_citation_index(*, run_id: str, max_chunks: int = 800) -> Dict[str,
             "SELECT id, payload_json FROM events WHERE run_id=? AND type='guardrail.warned' ORDER BY id DESC LIMIT 20",
             (rid,),
         )
-        for _id, payload_json in cur.fetchall() or []:
+        for _id, payload_json in cur:
             pj = _safe_json(payload_json) or {}
             if not isinstance(pj, dict):
                 continue
@@ -390,23 +601,24 @@ def _load_uak_citation_index(*, run_id: str, max_chunks: int = 800) -> Dict[str,
             warnings.append(pj)
     except Exception:
         warnings = []
-
-    try:
-        con.close()
-    except Exception:
-        pass
+        _drop_uak_conn()
 
     return {"chunks": chunks, "warnings": warnings}
 
 @app.middleware("http")
 async def lang_middleware(request: Request, call_next):
+    lang_cookie = request.cookies.get("lang")
+    if lang_cookie and not request.query_params.get("lang"):
+        # Returning client with a stored choice: nothing to detect and no cookie to (re)write.
+        request.state.lang = normalize_lang(lang_cookie)
+        return await call_next(request)
     lang = detect_lang(request)
     request.state.lang = lang
     response = await call_next(request)
     qlang = request.query_params.get("lang")
     if qlang:
         response.set_cookie("lang", normalize_lang(qlang), max_age=3600 * 24 * 365, samesite="lax")
-    elif not request.cookies.get("lang"):
+    elif not lang_cookie:
         # Persist initial language choice for embedded WebViews that may not send a stable Accept-Language.
         response.set_cookie("lang", normalize_lang(lang), max_age=3600 * 24 * 365, samesite="lax")
     return response
@@ -416,10 +628,14 @@ def _now() -> str:
     return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
 
+_RE_SLUG_BAD = re.compile(r"[^a-z0-9\-]+")
+_RE_SLUG_DASH = re.compile(r"-+")
+
+
 def _slug(s: str) -> str:
     s = s.strip().lower()
-    s = re.sub(r"[^a-z0-9\-]+", "-", s)
-    s = re.sub(r"-+", "-", s).strip("-")
+    s = _RE_SLUG_BAD.sub("-", s)
+    s = _RE_SLUG_DASH.sub("-", s).strip("-")
     return s or "workspace"
 
 
@@ -456,23 +672,34 @@ def on_startup() -> None:
         guess = (BASE_DIR.parents[2] / "skills") if len(BASE_DIR.parents) >= 3 else (Path.cwd() / "skills")
         skills_dir = guess if guess.exists() else Path("/app/skills")
     if skills_dir.exists():
-        for yml in sorted(skills_dir.glob("*.yaml")):
-            _import_skill_from_yaml(str(yml), ignore_if_exists=True)
+        # Read and parse the YAML files concurrently (file I/O and libyaml release the GIL), then
+        # import them one by one in sorted order so name de-duplication stays deterministic.
+        ymls = sorted(skills_dir.glob("*.yaml"))
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            parsed = list(ex.map(_read_skill_yaml, ymls))
+        for yml, data in zip(ymls, parsed):
+            _import_skill_from_yaml(str(yml), ignore_if_exists=True, data=data)
 
     # Backfill skill_meta rows for existing skills.
     try:
         now = _now()
-        for s in q_all("SELECT id, yaml_path FROM skills", ()):
-            exec_sql(
-                "INSERT OR IGNORE INTO skill_meta (skill_id, enabled, source, updated_at) VALUES (?,?,?,?)",
-                (s["id"], 1, s.get("yaml_path") or "", now),
-            )
+        rows = [(s["id"], 1, s.get("yaml_path") or "", now) for s in q_all("SELECT id, yaml_path FROM skills", ())]
+        exec_many(
+            "INSERT OR IGNORE INTO skill_meta (skill_id, enabled, source, updated_at) VALUES (?,?,?,?)",
+            rows,
+        )
     except Exception:
         pass
 
     start_scheduler()
 
 
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    stop_scheduler()
+    close_db()
+
+
 class AutoTaskCreate(BaseModel):
     goal: str
     mode: Optional[str] = "fast"
@@ -526,13 +753,69 @@ class MCPServerUpsert(BaseModel):
     enabled: bool = True
 
 
-def _import_skill_from_yaml(yaml_path: str, ignore_if_exists: bool = False) -> Dict[str, Any]:
+@functools.cache
+def _http_session() -> Any:
+    # Shared keep-alive pool for skill downloads; repeat installs/reloads from one host skip DNS + TLS setup.
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    sess = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    sess.mount("http://", adapter)
+    sess.mount("https://", adapter)
+    return sess
+
+
+_SKILL_DOWNLOAD_MAX = 2_000_000
+
+
+def _download_skill_text(url: str) -> str:
+    # Stream the body and stop at the size cap instead of buffering an arbitrarily large response first.
+    try:
+        with _http_session().get(url, timeout=25, stream=True) as r:
+            r.raise_for_status()
+            buf = bytearray()
+            for chunk in r.iter_content(chunk_size=64 * 1024):
+                buf += chunk
+                if len(buf) > _SKILL_DOWNLOAD_MAX:
+                    raise HTTPException(status_code=400, detail="file too large")
+            encoding = r.encoding or "utf-8"
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"download failed: {e}")
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        # Server-declared charset Python doesn't know (e.g. "utf8mb4"): skill YAML is UTF-8 in practice.
+        encoding = "utf-8"
+    return str(buf, encoding, errors="replace")
+
+
+@functools.cache
+def _yaml_safe_loader() -> Any:
     import yaml
 
+    # libyaml-backed loader when PyYAML was built with it; the pure-Python one otherwise.
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _read_skill_yaml(p: Path) -> Dict[str, Any]:
+    import yaml
+
+    # Hand libyaml the raw bytes; it decodes UTF-8 itself instead of us building an intermediate str.
+    with p.open("rb") as fh:
+        return yaml.load(fh, Loader=_yaml_safe_loader()) or {}
+
+
+def _import_skill_from_yaml(
+    yaml_path: str, ignore_if_exists: bool = False, data: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     p = Path(yaml_path)
-    if not p.exists():
-        raise HTTPException(status_code=404, detail=f"Skill YAML not found: {yaml_path}")
-    data = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+    if data is None:
+        if not p.exists():
+            raise HTTPException(status_code=404, detail=f"Skill YAML not found: {yaml_path}")
+        data = _read_skill_yaml(p)
     name = data.get("name") or p.stem
     description = data.get("description") or ""
     system_prompt = data.get("system_prompt") or ""
@@ -589,11 +872,25 @@ def api_icon_png(size: int = 128) -> Response:
         return Response(content=svg, media_type="image/svg+xml")
 
 
+_RE_WS = re.compile(r"\s+")
+# Goal -> title heuristics (see _summarize_goal / _summarize_goal_legacy).
+_RE_ZH_PREFIX = re.compile(r"^(请你|请|帮我|麻烦|帮忙)\s*")
+_RE_ZH_PREFIX_LEGACY = re.compile(r"^(请帮我|请你|请|帮我|麻烦|帮忙)\s*")
+_RE_ZH_SPLIT = re.compile(r"[。！？\n]")
+_RE_ZH_TAIL = re.compile(r"(最终|最后|然后|并且|同时|要求|需要)")
+_RE_ZH_TAIL_LEGACY = re.compile(r"(最终|并且|然后|最后|要求)")
+_RE_EN_PLEASE = re.compile(r"^please\s+", re.I)
+_RE_EN_SPLIT = re.compile(r"[.!?\n]")
+_RE_EN_TAIL = re.compile(r"(in the end|finally|then|requirements?:|requirement:|and)", re.I)
+_RE_EN_TAIL_LEGACY = re.compile(r"(in the end|finally|and|then|requirements:|requirement:)", re.I)
+
+
+@functools.lru_cache(maxsize=2048)
 def _normalize_goal_text(goal: str) -> str:
     s = str(goal or "").strip()
     if not s:
         return ""
-    return re.sub(r"\s+", " ", s).strip()
+    return _RE_WS.sub(" ", s).strip()
 
 
 def _summarize_goal_legacy(goal: str, lang: str) -> tuple[str, str]:
@@ -637,13 +934,13 @@ def _summarize_goal_legacy(goal: str, lang: str) -> tuple[str, str]:
 
     domain = g
     if zh:
-        domain = re.sub(r"^(请帮我|请你|请|帮我|麻烦|帮忙)\\s*", "", domain)
-        domain = re.split(r"[。！？\\n]", domain)[0]
-        domain = re.split(r"(最终|并且|然后|最后|要求)", domain, maxsplit=1)[0]
+        domain = _RE_ZH_PREFIX_LEGACY.sub("", domain)
+        domain = _RE_ZH_SPLIT.split(domain)[0]
+        domain = _RE_ZH_TAIL_LEGACY.split(domain, maxsplit=1)[0]
     else:
-        domain = re.sub(r"^please\\s+", "", domain, flags=re.I)
-        domain = re.split(r"[.!?\\n]", domain)[0]
-        domain = re.split(r"(in the end|finally|and|then|requirements:|requirement:)", domain, maxsplit=1, flags=re.I)[0]
+        domain = _RE_EN_PLEASE.sub("", domain)
+        domain = _RE_EN_SPLIT.split(domain)[0]
+        domain = _RE_EN_TAIL_LEGACY.split(domain, maxsplit=1)[0]
     domain = domain.strip(" ,，;；:：-—")
     # UI requirement: keep titles extremely short (<=10 Chinese chars).
     max_domain = 10 if zh else 28
@@ -679,8 +976,31 @@ def _summarize_goal(goal: str, lang: str) -> tuple[str, str]:
     g = _normalize_goal_text(goal)
     if not g:
         return ("", "")
+    return _summarize_goal_cached(g, str(lang or "").strip().lower().startswith("zh"))
+
+
+def _kw(*terms: str) -> "re.Pattern[str]":
+    # One alternation per keyword category, matched against the lowercased goal.
+    return re.compile("|".join(re.escape(t) for t in dict.fromkeys(t.lower() for t in terms)))
+
+
+_KW_PPT = _kw("ppt", "powerpoint", "slides", "幻灯片", "演示稿", "讲解PPT", "讲解ppt")
+_KW_VIDEO = _kw("视频稿", "视频脚本", "讲解稿", "video script", "script")
+_KW_REPORT = _kw("报告", "report", "analysis", "总结", "调研")
+_KW_PDF = _kw("pdf")
+_KW_DOCX = _kw("docx", ".docx", "word", ".doc")
+_KW_MARKDOWN = _kw("markdown", ".md")
+_KW_IMAGES = _kw("png", "jpg", "jpeg", "图片", "image")
+_KW_CITATIONS = _kw("引用", "文献", "论文", "cite", "citation", "sources", "出处", "来源")
+_KW_RIGOROUS = _kw("严谨", "rigorous", "rigor")
+_KW_COMPREHENSIVE = _kw("全面", "comprehensive")
+_KW_SOTA = _kw("前沿", "sota", "state-of-the-art", "最先进")
+
+
+# Pure function of (normalized goal, zh): the sidebar re-summarizes the same goals on every render.
+@functools.lru_cache(maxsize=4096)
+def _summarize_goal_cached(g: str, zh: bool) -> tuple[str, str]:
     gl = g.lower()
-    zh = str(lang or "").strip().lower().startswith("zh")
 
     # UI requirement: keep titles extremely short (<=10 Chinese chars).
     max_title = 10 if zh else 28
@@ -695,66 +1015,62 @@ def _summarize_goal(goal: str, lang: str) -> tuple[str, str]:
             return ss[:n]
         return ss[: max(0, n - 1)].rstrip() + "…"
 
-    def _has(terms: list[str]) -> bool:
-        for t in terms:
-            if not t:
-                continue
-            tl = t.lower()
-            if tl and tl in gl:
-                return True
-            if t in g:
-                return True
-        return False
-
     deliverables: list[str] = []
-    if _has(["ppt", "powerpoint", "slides", "幻灯片", "演示稿", "讲解PPT", "讲解ppt"]):
+    if _KW_PPT.search(gl):
         deliverables.append("PPT")
-    if _has(["视频稿", "视频脚本", "讲解稿", "video script", "script"]):
+    if _KW_VIDEO.search(gl):
         deliverables.append("视频稿" if zh else "Video script")
-    if _has(["报告", "report", "analysis", "总结", "调研"]):
+    if _KW_REPORT.search(gl):
         deliverables.append("报告" if zh else "Report")
-    if _has(["pdf"]):
+    if _KW_PDF.search(gl):
         deliverables.append("PDF")
-    if _has(["docx", ".docx", "word", ".doc"]):
+    if _KW_DOCX.search(gl):
         deliverables.append("DOCX")
-    if _has(["markdown", ".md"]):
+    if _KW_MARKDOWN.search(gl):
         deliverables.append("Markdown")
-    if _has(["png", "jpg", "jpeg", "图片", "image"]):
+    if _KW_IMAGES.search(gl):
         deliverables.append("图片" if zh else "Images")
     deliverables = list(dict.fromkeys(deliverables))
 
     domain = g
     if zh:
-        domain = re.sub(r"^(请你|请|帮我|麻烦|帮忙)\\s*", "", domain)
-        domain = re.split(r"[。！？\\n]", domain)[0]
-        domain = re.split(r"(最终|最后|然后|并且|同时|要求|需要)", domain, maxsplit=1)[0]
+        domain = _RE_ZH_PREFIX.sub("", domain)
+        domain = _RE_ZH_SPLIT.split(domain)[0]
+        domain = _RE_ZH_TAIL.split(domain, maxsplit=1)[0]
     else:
-        domain = re.sub(r"^please\\s+", "", domain, flags=re.I)
-        domain = re.split(r"[.!?\\n]", domain)[0]
-        domain = re.split(
-            r"(in the end|finally|then|requirements?:|requirement:|and)",
-            domain,
-            maxsplit=1,
-            flags=re.I,
-        )[0]
+        domain = _RE_EN_PLEASE.sub("", domain)
+        domain = _RE_EN_SPLIT.split(domain)[0]
+        domain = _RE_EN_TAIL.split(domain, maxsplit=1)[0]
     domain = domain.strip(" ,，;；:：-—")
 
     title = _clip(domain or (deliverables[0] if deliverables else g), max_title)
 
     constraints: list[str] = []
-    if _has(["引用", "文献", "论文", "cite", "citation", "sources", "出处", "来源"]):
+    if _KW_CITATIONS.search(gl):
         constraints.append("含引用" if zh else "With citations")
-    if _has(["严谨", "rigorous", "rigor"]):
+    if _KW_RIGOROUS.search(gl):
         constraints.append("尽量严谨" if zh else "Rigorous")
-    if _has(["全面", "comprehensive"]):
+    if _KW_COMPREHENSIVE.search(gl):
         constraints.append("尽量全面" if zh else "Comprehensive")
-    if _has(["前沿", "sota", "state-of-the-art", "最先进"]):
+    if _KW_SOTA.search(gl):
         constraints.append("偏前沿" if zh else "State-of-the-art")
     constraints = list(dict.fromkeys(constraints))
     subtitle = " · ".join(constraints)
     return (title.strip(), subtitle.strip())
 
 
+def _recent_tasks(q: str, limit: int) -> List[Dict[str, Any]]:
+    # Filter in SQL so a search returns the newest `limit` matches, not the matches among the newest `limit`.
+    # instr() is a plain substring test (no LIKE wildcards to escape); LOWER() folds ASCII only.
+    # Only the columns the sidebar shows; plan/result JSON blobs stay in SQLite.
+    q_lower = q.lower()
+    return q_all(
+        "SELECT id, goal, status, updated_at FROM tasks WHERE ?='' OR instr(LOWER(goal), ?) > 0 "
+        "ORDER BY updated_at DESC LIMIT ?",
+        (q_lower, q_lower, limit),
+    )
+
+
 def render(template: str, **ctx: Any) -> HTMLResponse:
     request: Optional[Request] = ctx.get("request")
     if request is not None:
@@ -767,10 +1083,7 @@ def render(template: str, **ctx: Any) -> HTMLResponse:
         q = request.query_params.get("q") or ""
         ctx.setdefault("q", q)
         if "sidebar_tasks" not in ctx:
-            sidebar_tasks = q_all("SELECT * FROM tasks ORDER BY updated_at DESC LIMIT 50", ())
-            if q:
-                q_lower = q.lower()
-                sidebar_tasks = [t for t in sidebar_tasks if q_lower in (t.get("goal") or "").lower()]
+            sidebar_tasks = _recent_tasks(q, 50)
             for t in sidebar_tasks:
                 try:
                     title, subtitle = _summarize_goal(t.get("goal") or "", lang)
@@ -791,81 +1104,148 @@ def render(template: str, **ctx: Any) -> HTMLResponse:
     ctx.setdefault("build_id", APP_BUILD_ID)
     ctx.setdefault("build_time", APP_BUILD_TIME)
     ctx.setdefault("static_version", STATIC_VERSION)
-    t = jinja.get_template(template)
+    t = _TPL.get(template) or jinja.get_template(template)
     return HTMLResponse(t.render(**ctx))
 
 
-@app.get("/", response_class=HTMLResponse)
-def ui_index(request: Request) -> HTMLResponse:
-    q = request.query_params.get("q") or ""
-    tasks = q_all("SELECT * FROM tasks ORDER BY updated_at DESC LIMIT 20", ())
-    if q:
-        q_lower = q.lower()
-        tasks = [t for t in tasks if q_lower in (t.get("goal") or "").lower()]
-    for t in tasks:
-        t["plan"] = from_json(t.get("plan_json"))
-    workspaces = q_all("SELECT * FROM workspaces ORDER BY created_at ASC", ())
-    default_workspace_id = request.cookies.get("default_workspace_id") or (workspaces[0]["id"] if workspaces else "")
-    default_workspace_name = ""
-    for w in workspaces:
-        if w.get("id") == default_workspace_id:
-            default_workspace_name = w.get("name") or ""
-            break
+# Row decorators for q_all_cached: JSON columns are decoded once per fetch and reused until the next write.
+_SKILLS_WITH_META_SQL = (
+    "SELECT s.*, COALESCE(m.enabled, 1) AS enabled, COALESCE(m.source, '') AS source "
+    "FROM skills s LEFT JOIN skill_meta m ON m.skill_id=s.id ORDER BY s.created_at DESC"
+)
 
-    lang = getattr(request.state, "lang", "en")
 
-    # Quick action chips (do not force a skill; they only help users phrase goals)
-    if lang == "zh":
-        quick_skills = [
+def _prep_skill_row(r: Dict[str, Any]) -> None:
+    r["allowed_tools"] = from_json(r.get("allowed_tools_json")) or []
+
+
+def _prep_settings_skill_row(r: Dict[str, Any]) -> None:
+    r["enabled"] = bool(r.get("enabled"))
+    _prep_skill_row(r)
+    src = str(r.get("source") or "").strip()
+    r["source_display"] = src
+    if src.startswith("{") and src.endswith("}"):
+        try:
+            j = from_json(src)
+            if isinstance(j, dict) and str(j.get("type") or "").strip().lower() == "url":
+                u = str(j.get("url") or "").strip()
+                if u:
+                    r["source_display"] = u
+        except Exception:
+            r["source_display"] = src
+
+
+def _prep_recipe_row(r: Dict[str, Any]) -> None:
+    r["form"] = from_json(r.get("form_json")) or {}
+
+
+def _prep_mcp_server_row(r: Dict[str, Any]) -> None:
+    r["args"] = from_json(r.get("args_json")) or []
+    r["env"] = from_json(r.get("env_json")) or {}
+    r["healthcheck_args"] = from_json(r.get("healthcheck_args_json")) or []
+    r["enabled"] = bool(r.get("enabled"))
+
+
+# Static index-page content per UI language; shared across requests, so templates must treat it as read-only.
+_INDEX_CHIPS: Dict[str, Tuple[List[Dict[str, str]], Dict[str, str]]] = {
+    "zh": (
+        [
             {"name": "file", "emoji": "🗂", "label": "文件整理"},
             {"name": "research", "emoji": "🔎", "label": "深度调研"},
             {"name": "batch", "emoji": "🧩", "label": "批量处理"},
             {"name": "life", "emoji": "🗓", "label": "计划/复盘"},
-        ]
-        suggestion_presets = {
+        ],
+        {
             "file": "帮我整理这个文件夹：\n- 按类型/日期归档\n- 生成清单\n",
             "research": "围绕这个主题做一次深度调研，并输出报告：\n",
             "batch": "批量处理这些内容（请先说明规则）：\n",
             "life": "帮我制定一个可执行的计划：\n",
-        }
-        hour = time.localtime().tm_hour
-        if hour < 11:
-            greeting = "早上好，和我一起工作吧！"
-        elif hour < 14:
-            greeting = "中午好，和我一起工作吧！"
-        elif hour < 18:
-            greeting = "下午好，和我一起工作吧！"
-        else:
-            greeting = "晚上好，和我一起工作吧！"
-    else:
-        quick_skills = [
+        },
+    ),
+    "en": (
+        [
             {"name": "file", "emoji": "🗂", "label": "File organize"},
             {"name": "research", "emoji": "🔎", "label": "Deep research"},
             {"name": "batch", "emoji": "🧩", "label": "Batch process"},
             {"name": "life", "emoji": "🗓", "label": "Planning"},
-        ]
-        suggestion_presets = {
+        ],
+        {
             "file": "Help me organize this folder:\n- Archive by type/date\n- Generate an index\n",
             "research": "Do deep research on this topic and output a report:\n",
             "batch": "Batch-process these items (specify rules first):\n",
             "life": "Help me create an actionable plan:\n",
-        }
-        hour = time.localtime().tm_hour
-        if hour < 11:
-            greeting = "Good morning — let's work together!"
-        elif hour < 18:
-            greeting = "Good afternoon — let's work together!"
-        else:
-            greeting = "Good evening — let's work together!"
+        },
+    ),
+}
+
+# (hour upper bound, greeting) per UI language; the first bound above the current hour wins.
+_GREETINGS: Dict[str, Tuple[Tuple[int, str], ...]] = {
+    "zh": (
+        (11, "早上好，和我一起工作吧！"),
+        (14, "中午好，和我一起工作吧！"),
+        (18, "下午好，和我一起工作吧！"),
+        (24, "晚上好，和我一起工作吧！"),
+    ),
+    "en": (
+        (11, "Good morning — let's work together!"),
+        (18, "Good afternoon — let's work together!"),
+        (24, "Good evening — let's work together!"),
+    ),
+}
+
+
+def _greeting(ui_lang: str, hour: int) -> str:
+    for limit, text in _GREETINGS[ui_lang]:
+        if hour < limit:
+            return text
+    return _GREETINGS[ui_lang][-1][1]
+
+
+def _index_etag(request: Request, q: str) -> str:
+    # Everything the index page depends on: DB state (any committed write bumps write_seq), the process
+    # (STATIC_VERSION is per start), and the request-scoped inputs, plus the hour for the greeting.
+    key = "\0".join(
+        (
+            str(write_seq()),
+            STATIC_VERSION,
+            APP_BUILD_ID,
+            str(getattr(request.state, "lang", "en")),
+            q,
+            request.cookies.get("default_workspace_id") or "",
+            str(time.localtime().tm_hour),
+        )
+    )
+    return '"' + hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest() + '"'
+
+
+@app.get("/", response_class=HTMLResponse)
+def ui_index(request: Request) -> HTMLResponse:
+    q = request.query_params.get("q") or ""
+    etag = _index_etag(request, q)
+    if etag in (request.headers.get("if-none-match") or ""):
+        return Response(status_code=304, headers={"ETag": etag})
+    workspaces = q_all("SELECT * FROM workspaces ORDER BY created_at ASC", ())
+    default_workspace_id = request.cookies.get("default_workspace_id") or (workspaces[0]["id"] if workspaces else "")
+    default_workspace_name = ""
+    for w in workspaces:
+        if w.get("id") == default_workspace_id:
+            default_workspace_name = w.get("name") or ""
+            break
+
+    lang = getattr(request.state, "lang", "en")
+
+    # Quick action chips (do not force a skill; they only help users phrase goals)
+    ui_lang = "zh" if lang == "zh" else "en"
+    quick_skills, suggestion_presets = _INDEX_CHIPS[ui_lang]
+    greeting = _greeting(ui_lang, time.localtime().tm_hour)
 
     recipes = q_all("SELECT * FROM recipes WHERE enabled=1 ORDER BY updated_at DESC LIMIT 8", ())
     for r in recipes:
         r["form"] = from_json(r.get("form_json")) or {}
 
-    return render(
+    resp = render(
         "index.html",
         request=request,
-        tasks=tasks,
         default_workspace_id=default_workspace_id,
         default_workspace_name=default_workspace_name,
         quick_skills=quick_skills,
@@ -874,32 +1254,28 @@ def ui_index(request: Request) -> HTMLResponse:
         recipes=recipes,
         admin_token=settings.ui_admin_token,
     )
+    resp.headers["ETag"] = etag
+    return resp
 
 
 @app.get("/workspaces", response_class=HTMLResponse)
 def ui_workspaces(request: Request) -> HTMLResponse:
-    workspaces = q_all("SELECT * FROM workspaces ORDER BY created_at DESC", ())
+    workspaces = q_all_cached("SELECT * FROM workspaces ORDER BY created_at DESC", ())
     return render("workspaces.html", request=request, workspaces=workspaces, admin_token=settings.ui_admin_token)
 
 
 @app.get("/skills", response_class=HTMLResponse)
 def ui_skills(request: Request) -> HTMLResponse:
-    skills = q_all(
-        "SELECT s.*, COALESCE(m.enabled, 1) AS enabled, COALESCE(m.source, '') AS source "
-        "FROM skills s LEFT JOIN skill_meta m ON m.skill_id=s.id ORDER BY s.created_at DESC",
-        (),
-    )
-    for s in skills:
-        s["allowed_tools"] = from_json(s.get("allowed_tools_json")) or []
+    skills = q_all_cached(_SKILLS_WITH_META_SQL, (), prepare=_prep_skill_row)
     tools = list_tools()
     return render("skills.html", request=request, skills=skills, tools=tools, admin_token=settings.ui_admin_token)
 
 
 @app.get("/schedules", response_class=HTMLResponse)
 def ui_schedules(request: Request) -> HTMLResponse:
-    schedules = q_all("SELECT * FROM schedules ORDER BY created_at DESC", ())
-    skills = q_all("SELECT * FROM skills ORDER BY name ASC", ())
-    workspaces = q_all("SELECT * FROM workspaces ORDER BY name ASC", ())
+    schedules = q_all_cached("SELECT * FROM schedules ORDER BY created_at DESC", ())
+    skills = q_all_cached("SELECT * FROM skills ORDER BY name ASC", ())
+    workspaces = q_all_cached("SELECT * FROM workspaces ORDER BY name ASC", ())
     return render("schedules.html", request=request, schedules=schedules, skills=skills, workspaces=workspaces, admin_token=settings.ui_admin_token)
 
 
@@ -915,26 +1291,13 @@ def ui_task_detail(request: Request, task_id: str) -> HTMLResponse:
         s["result"] = from_json(s.get("result_json"))
     approvals = q_all("SELECT * FROM approvals WHERE task_id=? ORDER BY requested_at DESC", (task_id,))
 
-    report_preview = ""
     report_path = str(task.get("output_path") or "").strip()
-    if report_path:
-        try:
-            p = Path(report_path)
-            if p.exists() and p.is_file():
-                b = p.read_bytes()
-                if len(b) > 240_000:
-                    b = b[:240_000] + b"\n\n--- TRUNCATED ---\n"
-                report_preview = b.decode("utf-8", errors="ignore")
-        except Exception:
-            report_preview = ""
+    report_preview = _report_preview(report_path) if report_path else ""
 
     artifacts: List[Dict[str, Any]] = []
     try:
-        base = settings.artifacts_dir / task_id
-        if base.exists():
-            for p in base.rglob("*"):
-                if p.is_file():
-                    artifacts.append({"path": str(p), "size": p.stat().st_size})
+        for entry, _rel, st in _walk_files(settings.artifacts_dir / task_id):
+            artifacts.append({"path": entry.path, "size": st.st_size})
         artifacts.sort(key=lambda a: a.get("path") or "")
     except Exception:
         artifacts = []
@@ -954,25 +1317,7 @@ def ui_task_detail(request: Request, task_id: str) -> HTMLResponse:
 @app.get("/settings", response_class=HTMLResponse)
 def ui_settings(request: Request) -> HTMLResponse:
     workspaces = q_all("SELECT * FROM workspaces ORDER BY created_at ASC", ())
-    skills = q_all(
-        "SELECT s.*, COALESCE(m.enabled, 1) AS enabled, COALESCE(m.source, '') AS source "
-        "FROM skills s LEFT JOIN skill_meta m ON m.skill_id=s.id ORDER BY s.created_at DESC",
-        (),
-    )
-    for s in skills:
-        s["enabled"] = bool(s.get("enabled"))
-        s["allowed_tools"] = from_json(s.get("allowed_tools_json")) or []
-        src = str(s.get("source") or "").strip()
-        s["source_display"] = src
-        if src.startswith("{") and src.endswith("}"):
-            try:
-                j = json.loads(src)
-                if isinstance(j, dict) and str(j.get("type") or "").strip().lower() == "url":
-                    u = str(j.get("url") or "").strip()
-                    if u:
-                        s["source_display"] = u
-            except Exception:
-                s["source_display"] = src
+    skills = q_all_cached(_SKILLS_WITH_META_SQL, (), prepare=_prep_settings_skill_row)
     default_workspace_id = request.cookies.get("default_workspace_id") or (workspaces[0]["id"] if workspaces else "")
     provider = {
         "OPENAI_BASE_URL": os.getenv("OPENAI_BASE_URL", settings.llm_base_url),
@@ -1017,9 +1362,7 @@ def ui_settings(request: Request) -> HTMLResponse:
 
 @app.get("/recipes", response_class=HTMLResponse)
 def ui_recipes(request: Request) -> HTMLResponse:
-    recipes = q_all("SELECT * FROM recipes ORDER BY updated_at DESC", ())
-    for r in recipes:
-        r["form"] = from_json(r.get("form_json")) or {}
+    recipes = q_all_cached("SELECT * FROM recipes ORDER BY updated_at DESC", (), prepare=_prep_recipe_row)
     return render("recipes.html", request=request, recipes=recipes, admin_token=settings.ui_admin_token)
 
 
@@ -1040,10 +1383,9 @@ async def api_events() -> StreamingResponse:
     async def event_gen():
         try:
             # initial comment for some proxies
-            yield ": connected\n\n"
-            loop = asyncio.get_running_loop()
+            yield b": connected\n\n"
             while True:
-                ev = await loop.run_in_executor(None, q.get)
+                ev = await q.aget()
                 yield format_sse(ev)
         finally:
             unsubscribe(q)
@@ -1053,7 +1395,7 @@ async def api_events() -> StreamingResponse:
 
 @app.get("/api/workspaces")
 def api_list_workspaces() -> List[Dict[str, Any]]:
-    return q_all("SELECT * FROM workspaces ORDER BY created_at DESC", ())
+    return q_all_cached("SELECT * FROM workspaces ORDER BY created_at DESC", ())
 
 
 @app.post("/api/workspaces")
@@ -1071,15 +1413,8 @@ def api_create_workspace(payload: WorkspaceCreate, request: Request) -> Dict[str
 
 
 @app.get("/api/skills")
-def api_list_skills() -> List[Dict[str, Any]]:
-    rows = q_all(
-        "SELECT s.*, COALESCE(m.enabled, 1) AS enabled, COALESCE(m.source, '') AS source "
-        "FROM skills s LEFT JOIN skill_meta m ON m.skill_id=s.id ORDER BY s.created_at DESC",
-        (),
-    )
-    for r in rows:
-        r["allowed_tools"] = from_json(r.get("allowed_tools_json")) or []
-    return rows
+def api_list_skills() -> Response:
+    return _API_JSON(content=q_all_cached(_SKILLS_WITH_META_SQL, (), prepare=_prep_skill_row))
 
 
 @app.post("/api/skills/import")
@@ -1139,7 +1474,7 @@ def api_reload_skill(skill_id: str, request: Request) -> Dict[str, Any]:
     path_override: Optional[str] = None
     if source.startswith("{") and source.endswith("}"):
         try:
-            src_obj = json.loads(source)
+            src_obj = from_json(source)
             if isinstance(src_obj, dict) and str(src_obj.get("type") or "").strip().lower() == "url":
                 url = str(src_obj.get("url") or "").strip() or None
                 path_override = str(src_obj.get("path") or "").strip() or None
@@ -1148,17 +1483,7 @@ def api_reload_skill(skill_id: str, request: Request) -> Dict[str, Any]:
             path_override = None
 
     if url:
-        import requests
-
-        try:
-            r = requests.get(url, timeout=25)
-            r.raise_for_status()
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"download failed: {e}")
-
-        text = r.text
-        if len(text) > 2_000_000:
-            raise HTTPException(status_code=400, detail="file too large")
+        text = _download_skill_text(url)
 
         downloads = settings.data_dir / "skills_downloads"
         downloads.mkdir(parents=True, exist_ok=True)
@@ -1217,17 +1542,7 @@ def api_install_skill_from_url(payload: SkillInstallUrl, request: Request) -> Di
     url = (payload.url or "").strip()
     if not (url.startswith("https://") or url.startswith("http://")):
         raise HTTPException(status_code=400, detail="url must be http(s)")
-    import requests
-
-    try:
-        r = requests.get(url, timeout=25)
-        r.raise_for_status()
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"download failed: {e}")
-
-    text = r.text
-    if len(text) > 2_000_000:
-        raise HTTPException(status_code=400, detail="file too large")
+    text = _download_skill_text(url)
 
     # Save under DATA_DIR/skills_downloads for provenance.
     downloads = settings.data_dir / "skills_downloads"
@@ -1253,22 +1568,24 @@ def api_install_skill_from_url(payload: SkillInstallUrl, request: Request) -> Di
 
 
 @app.get("/api/tasks")
-def api_list_tasks() -> List[Dict[str, Any]]:
+def api_list_tasks(detail_for: Optional[str] = None) -> Any:
     rows = q_all("SELECT * FROM tasks ORDER BY updated_at DESC LIMIT 200", ())
     for r in rows:
         r["plan"] = from_json(r.get("plan_json"))
-    return rows
+    if not detail_for:
+        # Plain SQLite/JSON values only: serialize directly instead of through jsonable_encoder.
+        return _API_JSON(content=rows)
+    # Desktop refresh: return the list and the selected task's detail in one round trip.
+    return {"tasks": rows, "detail": _task_detail(detail_for)}
 
 
 @app.get("/api/recipes")
 def api_list_recipes(enabled_only: bool = False) -> List[Dict[str, Any]]:
     if enabled_only:
-        rows = q_all("SELECT * FROM recipes WHERE enabled=1 ORDER BY updated_at DESC", ())
-    else:
-        rows = q_all("SELECT * FROM recipes ORDER BY updated_at DESC", ())
-    for r in rows:
-        r["form"] = from_json(r.get("form_json")) or {}
-    return rows
+        return q_all_cached(
+            "SELECT * FROM recipes WHERE enabled=1 ORDER BY updated_at DESC", (), prepare=_prep_recipe_row
+        )
+    return q_all_cached("SELECT * FROM recipes ORDER BY updated_at DESC", (), prepare=_prep_recipe_row)
 
 
 @app.post("/api/recipes")
@@ -1324,14 +1641,10 @@ def api_delete_recipe(recipe_id: str, request: Request) -> Dict[str, Any]:
 
 
 @app.get("/api/mcp_servers")
-def api_list_mcp_servers() -> List[Dict[str, Any]]:
-    rows = q_all("SELECT * FROM mcp_servers ORDER BY updated_at DESC", ())
-    for r in rows:
-        r["args"] = from_json(r.get("args_json")) or []
-        r["env"] = from_json(r.get("env_json")) or {}
-        r["healthcheck_args"] = from_json(r.get("healthcheck_args_json")) or []
-        r["enabled"] = bool(r.get("enabled"))
-    return rows
+def api_list_mcp_servers() -> Response:
+    return _API_JSON(
+        content=q_all_cached("SELECT * FROM mcp_servers ORDER BY updated_at DESC", (), prepare=_prep_mcp_server_row)
+    )
 
 
 @app.post("/api/mcp_servers")
@@ -1399,10 +1712,14 @@ def api_health_mcp_server(mcp_id: str, request: Request) -> Dict[str, Any]:
         args = ["--version"]
     env = os.environ.copy()
     env.update(from_json(row.get("env_json")) or {})
-    import subprocess
+    # Resolve the executable up front (against the server's env PATH overlay): a missing command fails here
+    # without spawning, and the child execs a full path instead of retrying execve along PATH.
+    exe = shutil.which(cmd, path=env.get("PATH")) if cmd else None
+    if not exe:
+        return {"ok": False, "error": f"command not found: {cmd}"}
 
     try:
-        p = subprocess.run([cmd, *map(str, args)], capture_output=True, text=True, env=env, timeout=5, check=False)
+        p = subprocess.run([exe, *map(str, args)], capture_output=True, text=True, env=env, timeout=5, check=False)
         out = (p.stdout or "").strip()
         err = (p.stderr or "").strip()
         return {
@@ -1444,7 +1761,7 @@ def api_cancel_task(task_id: str, request: Request) -> Dict[str, Any]:
 
 
 @app.get("/api/tasks/{task_id}/events")
-def api_task_events(task_id: str, after: int = 0, limit: int = 200, tail: bool = False) -> List[Dict[str, Any]]:
+def api_task_events(task_id: str, after: int = 0, limit: int = 200, tail: bool = False) -> Response:
     """
     Event timeline for a task.
 
@@ -1474,7 +1791,7 @@ def api_task_events(task_id: str, after: int = 0, limit: int = 200, tail: bool =
         )
     for r in rows:
         r["payload"] = from_json(r.get("payload_json")) or {}
-    return rows
+    return _API_JSON(content=rows)
 
 
 @app.get("/api/tasks/{task_id}/sidebar")
@@ -1484,26 +1801,13 @@ def api_task_sidebar(task_id: str, request: Request) -> Dict[str, Any]:
     if not task:
         raise HTTPException(status_code=404, detail="task not found")
 
-    report_preview = ""
     report_path = str(task.get("output_path") or "").strip()
-    if report_path:
-        try:
-            p = Path(report_path)
-            if p.exists() and p.is_file():
-                b = p.read_bytes()
-                if len(b) > 240_000:
-                    b = b[:240_000] + b"\n\n--- TRUNCATED ---\n"
-                report_preview = b.decode("utf-8", errors="ignore")
-        except Exception:
-            report_preview = ""
+    report_preview = _report_preview(report_path) if report_path else ""
 
     artifacts: List[Dict[str, Any]] = []
     try:
-        base = settings.artifacts_dir / task_id
-        if base.exists():
-            for p in base.rglob("*"):
-                if p.is_file():
-                    artifacts.append({"path": str(p), "size": p.stat().st_size})
+        for entry, _rel, st in _walk_files(settings.artifacts_dir / task_id):
+            artifacts.append({"path": entry.path, "size": st.st_size})
         artifacts.sort(key=lambda a: a.get("path") or "")
     except Exception:
         artifacts = []
@@ -1535,35 +1839,25 @@ def api_task_files(task_id: str, request: Request) -> Dict[str, Any]:
     out: list[dict[str, Any]] = []
 
     def _add_from_root(root: Path, *, root_kind: str) -> None:
-        if not root.exists():
-            return
-        for p in root.rglob("*"):
-            if not p.is_file():
-                continue
-            if p.name.endswith(".owb.json"):
-                continue
-            try:
-                rel = p.relative_to(root).as_posix()
-            except Exception:
-                continue
-            try:
-                st = p.stat()
-            except Exception:
-                continue
+        group = "artifacts" if root_kind == "a" else "outputs"
+        # .owb.json sidecars are editor state, not deliverables; they are dropped before any stat.
+        for entry, rel, st in _walk_files(root, skip_suffix=".owb.json"):
+            name = entry.name
             out.append(
                 {
                     "id": _encode_task_file_id(root=root_kind, rel=rel),
-                    "name": p.name,
+                    "name": name,
                     "rel": rel,
-                    "kind": _guess_kind(p),
-                    "size": int(st.st_size),
-                    "mtime": float(st.st_mtime),
-                    "group": "artifacts" if root_kind == "a" else "outputs",
+                    "kind": _guess_kind(name),
+                    "size": st.st_size,
+                    "mtime": st.st_mtime,
+                    "group": group,
                 }
             )
 
     try:
-        _add_from_root((settings.artifacts_dir / task_id).resolve(), root_kind="a")
+        # artifacts_dir is resolved once in config and task_id is a known DB id: no realpath needed here.
+        _add_from_root(settings.artifacts_dir / task_id, root_kind="a")
     except Exception:
         pass
     try:
@@ -1647,7 +1941,7 @@ def api_task_ppt_state(task_id: str, request: Request, file_id: str) -> Dict[str
     sidecar = path.with_suffix(".owb.json")
     if sidecar.exists() and sidecar.is_file():
         try:
-            deck = json.loads(sidecar.read_text(encoding="utf-8"))
+            deck = from_json(sidecar.read_text(encoding="utf-8"))
             if isinstance(deck, dict):
                 return {"ok": True, "editable": True, "source": "sidecar", "deck": deck}
         except Exception:
@@ -1657,7 +1951,7 @@ def api_task_ppt_state(task_id: str, request: Request, file_id: str) -> Dict[str
     run_id = ""
     try:
         base = (settings.artifacts_dir / task_id).resolve()
-        rel = path.resolve().relative_to(base).parts
+        rel = path.relative_to(base).parts  # path comes back from _resolve_task_file_path already resolved
         if len(rel) >= 2:
             run_id = str(rel[0])
     except Exception:
@@ -1671,18 +1965,16 @@ def api_task_ppt_state(task_id: str, request: Request, file_id: str) -> Dict[str
     if not db_path.exists() or db_path.stat().st_size <= 0:
         return {"ok": True, "editable": False, "source": "none", "deck": {}}
 
-    import sqlite3
-
     def _safe_json(s: Any) -> Any:
         try:
             if isinstance(s, str) and s:
-                return json.loads(s)
+                return from_json(s)
         except Exception:
             return None
         return None
 
     try:
-        con = sqlite3.connect(str(db_path))
+        con = _uak_conn()
     except Exception:
         return {"ok": True, "editable": False, "source": "none", "deck": {}}
 
@@ -1698,12 +1990,7 @@ def api_task_ppt_state(task_id: str, request: Request, file_id: str) -> Dict[str
         if isinstance(deck, dict) and deck.get("slides"):
             return {"ok": True, "editable": True, "source": "uak", "deck": deck}
     except Exception:
-        pass
-    finally:
-        try:
-            con.close()
-        except Exception:
-            pass
+        _drop_uak_conn()
 
     return {"ok": True, "editable": False, "source": "none", "deck": {}}
 
@@ -1740,7 +2027,7 @@ def api_task_ppt_save(task_id: str, payload: _PptSaveRequest, request: Request)
     run_id = ""
     try:
         base = (settings.artifacts_dir / task_id).resolve()
-        rel = path.resolve().relative_to(base).parts
+        rel = path.relative_to(base).parts  # path comes back from _resolve_task_file_path already resolved
         if len(rel) >= 2:
             run_id = str(rel[0])
     except Exception:
@@ -1945,11 +2232,10 @@ def ui_create_task_auto(
     return resp
 
 
-@app.get("/api/tasks/{task_id}")
-def api_get_task(task_id: str) -> Dict[str, Any]:
+def _task_detail(task_id: str) -> Optional[Dict[str, Any]]:
     task = q_one("SELECT * FROM tasks WHERE id=?", (task_id,))
     if not task:
-        raise HTTPException(status_code=404, detail="task not found")
+        return None
     task["plan"] = from_json(task.get("plan_json"))
     steps = q_all("SELECT * FROM steps WHERE task_id=? ORDER BY idx ASC", (task_id,))
     for s in steps:
@@ -1959,6 +2245,14 @@ def api_get_task(task_id: str) -> Dict[str, Any]:
     return {"task": task, "steps": steps, "approvals": approvals}
 
 
+@app.get("/api/tasks/{task_id}")
+def api_get_task(task_id: str) -> Dict[str, Any]:
+    detail = _task_detail(task_id)
+    if detail is None:
+        raise HTTPException(status_code=404, detail="task not found")
+    return detail
+
+
 @app.post("/api/tasks/{task_id}/approve/{step_id}")
 def api_approve(task_id: str, step_id: str, payload: ApprovalDecision, request: Request) -> Dict[str, Any]:
     _ensure_admin(request)
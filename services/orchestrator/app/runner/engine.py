@@ -11,7 +11,7 @@ from typing import Any, Dict, List, Optional, Tuple
 
 from ..config import settings
 from ..events import emit
-from ..db import exec_sql, from_json, get_conn, q_all, q_one, to_json
+from ..db import SQL_INSERT_EVENT_LOG, exec_sql, from_json, get_write_conn, q_all, q_one, to_json
 from ..tools.base import ToolContext, get_tool, run_tool
 from .planner import generate_plan
 from .executor import propose_patch
@@ -59,9 +59,9 @@ def render_prompt_template(text: str, *, vars: Dict[str, str]) -> str:
 
 def _log_event(*, task_id: str, step_id: Optional[str], event_type: str, payload: Dict[str, Any]) -> Optional[int]:
     try:
-        with get_conn() as con:
+        with get_write_conn() as con:
             cur = con.execute(
-                "INSERT INTO event_log (id, task_id, step_id, type, payload_json, ts, created_at) VALUES (?,?,?,?,?,?,?)",
+                SQL_INSERT_EVENT_LOG,
                 (_uuid(), task_id, step_id, event_type, to_json(payload), time.time(), _now()),
             )
             return int(cur.lastrowid or 0) or None
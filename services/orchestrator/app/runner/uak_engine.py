@@ -11,7 +11,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 from ..config import settings
-from ..db import exec_sql, from_json, get_conn, q_all, q_one, to_json
+from ..db import SQL_INSERT_EVENT_LOG, exec_sql, from_json, get_write_conn, q_all, q_one, to_json
 from ..events import emit
 from ..permissions import get_workspace_policy, grant_ask_once_scope, is_ask_once_scope_granted, scope_for_tool
 from ..tools.base import ToolContext, list_tools as list_app_tools, run_tool
@@ -79,9 +79,9 @@ def _is_task_canceled(task_id: str) -> bool:
 def _append_event_log(*, task_id: str, event_type: str, payload: Dict[str, Any], step_id: Optional[str] = None) -> None:
     try:
         seq: Optional[int] = None
-        with get_conn() as con:
+        with get_write_conn() as con:
             cur = con.execute(
-                "INSERT INTO event_log (id, task_id, step_id, type, payload_json, ts, created_at) VALUES (?,?,?,?,?,?,?)",
+                SQL_INSERT_EVENT_LOG,
                 (uuid.uuid4().hex, task_id, step_id, event_type, to_json(payload), time.time(), _now()),
             )
             seq = int(cur.lastrowid or 0) or None
@@ -35,6 +35,16 @@ def _path() -> Path:
     return _data_dir_fallback() / "runtime_env.json"
 
 
+def _reset_llm_config() -> None:
+    # The LLM client caches base URL / auth headers; make env changes visible to it.
+    try:
+        from .llm.client import reset_llm_config
+
+        reset_llm_config()
+    except Exception:
+        pass
+
+
 def load_runtime_env() -> Dict[str, str]:
     p = _path()
     if not p.exists():
@@ -58,6 +68,8 @@ def apply_runtime_env() -> Dict[str, str]:
         if v != "":
             os.environ[k] = v
 
+    _reset_llm_config()
+
     # Force UAK web-search policy to step-wise "auto" mode for all runs.
     # (This prevents host environment or other configs from switching it to always/off.)
     os.environ["UAK_WEB_SEARCH_POLICY"] = "auto"
@@ -75,6 +87,7 @@ def update_runtime_env(updates: Dict[str, Optional[str]]) -> Dict[str, str]:
         cur[k] = str(v)
         if v != "":
             os.environ[k] = str(v)
+    _reset_llm_config()
     p = _path()
     p.parent.mkdir(parents=True, exist_ok=True)
     p.write_text(json.dumps(cur, ensure_ascii=False, indent=2), encoding="utf-8")
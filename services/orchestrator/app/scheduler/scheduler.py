@@ -6,11 +6,18 @@ import time
 from typing import Any, Dict, Optional
 
 from ..config import settings
-from ..db import exec_sql, from_json, q_all, q_one, to_json
+from ..db import checkpoint_wal, exec_sql, from_json, optimize_db, q_all, q_one, to_json
 from ..runner.engine import create_task, start_task_background
 from .cron import Cron, CronError
 
 
+# How often the scheduler thread refreshes sqlite planner statistics.
+OPTIMIZE_INTERVAL_SECONDS = 900
+# How often it tries to truncate the WAL, and how long writes must have been quiet first.
+CHECKPOINT_INTERVAL_SECONDS = 60
+CHECKPOINT_IDLE_SECONDS = 5
+
+
 def _now_dt() -> dt.datetime:
     return dt.datetime.utcnow().replace(second=0, microsecond=0)
 
@@ -32,7 +39,15 @@ def _compute_next(expr: str, after: dt.datetime) -> dt.datetime:
 
 def tick_once() -> None:
     now = _now_dt()
-    schedules = q_all("SELECT * FROM schedules WHERE enabled=1", ())
+    # Only schedules that still need a first next_run_at or are due. Two branches rather than one OR, so each
+    # is an index seek on idx_schedules_next_run (an OR over the column degrades to a full index scan).
+    # ISO-8601 UTC strings compare in time order, so the text comparison matches _parse_iso(...) <= now.
+    schedules = q_all(
+        "SELECT * FROM schedules WHERE enabled=1 AND next_run_at IS NULL "
+        "UNION ALL "
+        "SELECT * FROM schedules WHERE enabled=1 AND next_run_at <= ?",
+        (_iso(now),),
+    )
     for sch in schedules:
         sch_id = sch["id"]
         expr = sch["cron_expr"]
@@ -67,11 +82,25 @@ class SchedulerThread(threading.Thread):
         self._stop = threading.Event()
 
     def run(self) -> None:
+        last_optimize = last_checkpoint = time.monotonic()
         while not self._stop.is_set():
             try:
                 tick_once()
             except Exception:
                 pass
+            if time.monotonic() - last_optimize >= OPTIMIZE_INTERVAL_SECONDS:
+                last_optimize = time.monotonic()
+                try:
+                    optimize_db()
+                except Exception:
+                    pass
+            if time.monotonic() - last_checkpoint >= CHECKPOINT_INTERVAL_SECONDS:
+                try:
+                    # Retried on the next tick if writes were still arriving.
+                    if checkpoint_wal(idle_seconds=CHECKPOINT_IDLE_SECONDS):
+                        last_checkpoint = time.monotonic()
+                except Exception:
+                    last_checkpoint = time.monotonic()
             self._stop.wait(settings.scheduler_tick_seconds)
 
     def stop(self) -> None:
@@ -11,7 +11,7 @@ from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 
 from ..config import settings
-from ..db import exec_many, exec_sql, from_json, q_all, q_one, to_json
+from ..db import exec_many, exec_sql, from_json, iter_blobs, q_all, q_one, to_json
 from ..llm import client as llm
 from .base import ToolContext, ToolSpec, register
 from .docs import docs_parse
@@ -19,6 +19,11 @@ from .docs import docs_parse
 
 SUPPORTED_EXTS = {".txt", ".md", ".pdf", ".docx"}
 
+# kb_chunks.embedding_dtype -> on-disk element type. New chunks are written as f16 (half the BLOB size);
+# rows written before the column existed default to f32. Scoring always upcasts to float32.
+EMBEDDING_DTYPES = {"f32": np.float32, "f16": np.float16}
+EMBEDDING_WRITE_DTYPE = "f16"
+
 
 def _now() -> str:
     return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
@@ -122,12 +127,12 @@ def kb_ingest(ctx: ToolContext, args: Dict[str, Any]) -> Dict[str, Any]:
         # delete old chunks for this doc if any
         exec_sql("DELETE FROM kb_chunks WHERE doc_id=?", (doc_id,))
         for idx, (chunk, vec) in enumerate(zip(chunks, vecs)):
-            arr = np.array(vec, dtype=np.float32)
+            arr = np.array(vec, dtype=EMBEDDING_DTYPES[EMBEDDING_WRITE_DTYPE])
             blob = arr.tobytes()
             chunk_id = hashlib.md5(f"{doc_id}:{idx}".encode()).hexdigest()
-            chunk_rows.append((chunk_id, doc_id, idx, chunk, blob, arr.shape[0], _now()))
+            chunk_rows.append((chunk_id, doc_id, idx, chunk, blob, arr.shape[0], EMBEDDING_WRITE_DTYPE, _now()))
         exec_many(
-            "INSERT INTO kb_chunks (id, doc_id, chunk_idx, text, embedding_blob, embedding_dim, created_at) VALUES (?,?,?,?,?,?,?)",
+            "INSERT INTO kb_chunks (id, doc_id, chunk_idx, text, embedding_blob, embedding_dim, embedding_dtype, created_at) VALUES (?,?,?,?,?,?,?,?)",
             chunk_rows,
         )
         chunk_rows.clear()
@@ -148,33 +153,55 @@ def kb_query(ctx: ToolContext, args: Dict[str, Any]) -> Dict[str, Any]:
     qvec = _embed(emb_model, [query])[0]
     qarr = np.array(qvec, dtype=np.float32)
     qnorm = np.linalg.norm(qarr) + 1e-12
+    dim = int(qarr.shape[0])
 
+    # Scan pass: rowids only; chunk text and doc metadata are fetched for the top-k hits afterwards.
+    # Only chunks embedded with the query's dimensionality are comparable.
     rows = q_all(
         """
-        SELECT c.id AS chunk_id, c.text AS chunk_text, c.embedding_blob AS embedding_blob, c.embedding_dim AS embedding_dim,
-               d.filename AS filename, d.path AS path, d.sha256 AS sha256
+        SELECT c.rowid AS rid, c.embedding_dtype AS embedding_dtype
         FROM kb_chunks c
         JOIN kb_docs d ON c.doc_id = d.id
-        WHERE d.workspace_id=?
+        WHERE d.workspace_id=? AND c.embedding_dim=?
         """,
-        (workspace_id,),
+        (workspace_id, dim),
     )
 
-    scored = []
-    for r in rows:
-        emb_blob = r["embedding_blob"]
-        dim = int(r["embedding_dim"])
-        carr = np.frombuffer(emb_blob, dtype=np.float32, count=dim)
-        denom = (np.linalg.norm(carr) + 1e-12) * qnorm
-        sim = float(np.dot(carr, qarr) / denom)
-        scored.append((sim, r))
+    # Stream each embedding straight into one contiguous (N, dim) matrix and score it in a single matmul.
+    dtypes = {int(r["rid"]): EMBEDDING_DTYPES.get(r["embedding_dtype"] or "f32", np.float32) for r in rows}
+    mat = np.empty((len(rows), dim), dtype=np.float32)
+    rids: List[int] = []
+    for rid, blob in iter_blobs("kb_chunks", "embedding_blob", list(dtypes)):
+        mat[len(rids)] = np.frombuffer(blob, dtype=dtypes[rid], count=dim)
+        rids.append(rid)
+    mat = mat[: len(rids)]
+    sims = (mat @ qarr) / ((np.linalg.norm(mat, axis=1) + 1e-12) * qnorm)
+    top = np.argsort(-sims, kind="stable")[:top_k]
+
+    top_rids = [rids[i] for i in top]
+    meta: Dict[int, Dict[str, Any]] = {}
+    if top_rids:
+        marks = ",".join("?" * len(top_rids))
+        for r in q_all(
+            f"""
+            SELECT c.rowid AS rid, c.id AS chunk_id, c.text AS chunk_text,
+                   d.filename AS filename, d.path AS path, d.sha256 AS sha256
+            FROM kb_chunks c
+            JOIN kb_docs d ON c.doc_id = d.id
+            WHERE c.rowid IN ({marks})
+            """,
+            tuple(top_rids),
+        ):
+            meta[int(r["rid"])] = r
 
-    scored.sort(key=lambda x: x[0], reverse=True)
     results = []
-    for sim, r in scored[:top_k]:
+    for i in top:
+        r = meta.get(rids[i])
+        if r is None:
+            continue
         results.append(
             {
-                "score": sim,
+                "score": float(sims[i]),
                 "chunk_id": r["chunk_id"],
                 "text": r["chunk_text"],
                 "source": {"filename": r["filename"], "path": r["path"], "sha256": r["sha256"]},